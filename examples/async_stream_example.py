@@ -0,0 +1,280 @@
+# coding: utf-8
+"""
+asyncio 向けのストリーム版 Top 'K' Elements / Sliding Window
+
+find_k_largest_numbers や max_sub_array_of_size_k を asyncio のサービスから使うと、
+非同期ストリームをいったんリストに溜めてからブロッキング呼び出しをすることになります。
+このモジュールの関数は `async for` で読める入力 (非同期イテラブル) を要素ごとに消費し、
+- 途中経過 (その時点の上位 K 個、その時点の最大ウィンドウ和) を定期的に返し、
+- slice_size 個の要素を処理するごとに await asyncio.sleep(0) でイベントループに制御を返す
+ため、1回の処理でイベントループを止める時間は slice_size 個分に抑えられます。
+
+バッチ処理:
+    要素ごとに await するコストが大きい場合は、入力を chunked=True でチャンク
+    (数値のリストなど) の非同期イテラブルとして渡せます。abatched() で要素のストリームを
+    チャンクにまとめられます。abatched は下流が次のチャンクを要求したときにだけ上流を読む
+    (プル型) ため、下流が遅ければ上流も待たされ、バックプレッシャーがそのまま伝わります。
+    溜める量は最大 size 個です。
+"""
+
+import asyncio
+import heapq
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Iterable, List, NamedTuple, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_SLICE_SIZE = 1024
+
+
+class TopKSnapshot(NamedTuple):
+    """その時点までの上位 K 個"""
+    count: int  # それまでに読んだ要素数
+    top: List[int]  # 上位 K 個 (降順)
+
+
+class WindowSnapshot(NamedTuple):
+    """その時点までのサイズ k のウィンドウ和"""
+    count: int  # それまでに読んだ要素数
+    max_sum: int  # 最大のウィンドウ和 (max_sub_array_of_size_k と同じく、ウィンドウがなければ 0)
+    window_sum: int  # 直近 k 個の和 (要素数が k 未満ならそれまでの和)
+
+
+async def abatched(source: AsyncIterable[T], size: int,
+                   max_delay: Optional[float] = None) -> AsyncIterator[List[T]]:
+    """
+    非同期イテラブルの要素を最大 size 個ずつのリストにまとめます。
+
+    Args:
+        source: 要素の非同期イテラブル
+        size: 1つのチャンクの最大要素数
+        max_delay: 指定すると、チャンクの最初の要素からこの秒数が経った時点で、
+            size 個に満たなくてもそのチャンクを返す (流量の少ないストリームで遅延を抑える)
+
+    Yields:
+        要素のリスト (最後のチャンク以外は、max_delay を指定しなければ size 個)
+    """
+    if size <= 0:
+        raise ValueError("size must be positive")
+    iterator = source.__aiter__()
+    if max_delay is None:
+        batch: List[T] = []
+        async for item in iterator:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        return
+
+    loop = asyncio.get_running_loop()
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            batch = []
+            deadline = None
+            while len(batch) < size:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                # wait_for と違い、時間切れでも読み込み中の __anext__ をキャンセルしない
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    break
+                try:
+                    item = pending.result()
+                except StopAsyncIteration:
+                    if batch:
+                        yield batch
+                    return
+                finally:
+                    if done:
+                        pending = None
+                batch.append(item)
+                if deadline is None:
+                    deadline = loop.time() + max_delay
+            yield batch
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def _aiter_values(source, chunked: bool, slice_size: int) -> AsyncIterator[Iterable[int]]:
+    """入力を最大 slice_size 個ずつの数値の列として返す (1つの列の処理がイベントループを止める単位)"""
+    if not chunked:
+        async for batch in abatched(source, slice_size):
+            yield batch
+        return
+    async for chunk in source:
+        if len(chunk) <= slice_size:
+            yield chunk
+        else:
+            view = memoryview(chunk) if isinstance(chunk, (bytes, bytearray, memoryview)) else chunk
+            for start in range(0, len(chunk), slice_size):
+                yield view[start:start + slice_size]
+
+
+async def aiter_k_largest_snapshots(source, k: int, snapshot_every: int = 0,
+                                    chunked: bool = False,
+                                    slice_size: int = DEFAULT_SLICE_SIZE) -> AsyncIterator[TopKSnapshot]:
+    """
+    非同期ストリームの上位 K 個を求め、途中経過を返します (find_k_largest_numbers の非同期版)。
+
+    Args:
+        source: 数値の非同期イテラブル (chunked=True なら数値のシーケンスの非同期イテラブル)
+        k: 見つけたい上位要素の数
+        snapshot_every: 0 より大きければ、snapshot_every 個の要素を読むごとに途中経過を返す
+        chunked: source がチャンクを返すかどうか
+        slice_size: イベントループに制御を返すまでに処理する要素数の上限
+
+    Yields:
+        TopKSnapshot。最後に必ず入力全体に対する結果を1回返す
+
+    時間計算量: O(N log K)
+    空間計算量: O(K + slice_size)
+    """
+    min_heap: List[int] = []
+    count = 0
+    next_snapshot = snapshot_every if snapshot_every > 0 else -1
+    async for values in _aiter_values(source, chunked, slice_size):
+        for num in values:
+            count += 1
+            if len(min_heap) < k:
+                heapq.heappush(min_heap, num)
+            elif k > 0 and num > min_heap[0]:
+                heapq.heappushpop(min_heap, num)
+            if count == next_snapshot:
+                yield TopKSnapshot(count, sorted(min_heap, reverse=True))
+                next_snapshot += snapshot_every
+        await asyncio.sleep(0)  # 1スライス分の処理ごとにイベントループに制御を返す
+    if count != next_snapshot - snapshot_every or count == 0:
+        yield TopKSnapshot(count, sorted(min_heap, reverse=True))
+
+
+async def async_find_k_largest_numbers(source, k: int, chunked: bool = False,
+                                       slice_size: int = DEFAULT_SLICE_SIZE) -> List[int]:
+    """
+    非同期ストリームの上位 K 個を返します。
+
+    Returns:
+        上位 K 個の数値を含むリスト (降順)。要素数が K 以下なら全要素。
+    """
+    result: List[int] = []
+    async for snapshot in aiter_k_largest_snapshots(source, k, chunked=chunked, slice_size=slice_size):
+        result = snapshot.top
+    return result
+
+
+async def aiter_max_window_snapshots(k: int, source, snapshot_every: int = 0,
+                                     chunked: bool = False,
+                                     slice_size: int = DEFAULT_SLICE_SIZE) -> AsyncIterator[WindowSnapshot]:
+    """
+    非同期ストリームでサイズ k の連続する部分配列の最大和を求め、途中経過を返します
+    (max_sub_array_of_size_k の非同期版)。
+
+    Args:
+        k: 部分配列のサイズ
+        source: 整数の非同期イテラブル (chunked=True なら整数のシーケンスの非同期イテラブル)
+        snapshot_every: 0 より大きければ、snapshot_every 個の要素を読むごとに途中経過を返す
+        chunked: source がチャンクを返すかどうか
+        slice_size: イベントループに制御を返すまでに処理する要素数の上限
+
+    Yields:
+        WindowSnapshot。最後に必ず入力全体に対する結果を1回返す
+
+    時間計算量: O(n)
+    空間計算量: O(k + slice_size)
+    """
+    max_sum = 0
+    window_sum = 0
+    window: deque = deque()
+    count = 0
+    next_snapshot = snapshot_every if snapshot_every > 0 else -1
+    async for values in _aiter_values(source, chunked, slice_size):
+        if k <= 0:
+            count += len(values)
+        else:
+            for value in values:
+                count += 1
+                window.append(value)  # ウィンドウの右端の要素を加える
+                window_sum += value
+                if len(window) > k:
+                    window_sum -= window.popleft()  # ウィンドウの左端の要素を引く
+                if len(window) == k and window_sum > max_sum:
+                    max_sum = window_sum
+                if count == next_snapshot:
+                    yield WindowSnapshot(count, max_sum, window_sum)
+                    next_snapshot += snapshot_every
+        await asyncio.sleep(0)
+    if count != next_snapshot - snapshot_every or count == 0:
+        yield WindowSnapshot(count, max_sum, window_sum)
+
+
+async def async_max_sub_array_of_size_k(k: int, source, chunked: bool = False,
+                                        slice_size: int = DEFAULT_SLICE_SIZE) -> int:
+    """
+    非同期ストリームでサイズ k の連続する部分配列の最大和を返します。
+
+    Returns:
+        int: max_sub_array_of_size_k と同じ値 (要素数が k 未満なら 0)
+    """
+    max_sum = 0
+    async for snapshot in aiter_max_window_snapshots(k, source, chunked=chunked, slice_size=slice_size):
+        max_sum = snapshot.max_sum
+    return max_sum
+
+
+# --- 実行例 ---
+if __name__ == "__main__":
+    async def numbers(values, delay=0.0):
+        for v in values:
+            if delay:
+                await asyncio.sleep(delay)
+            yield v
+
+    async def heartbeat(ticks):
+        # 集計と同時に動くタスク。イベントループが止められていれば tick が進まない
+        while True:
+            ticks[0] += 1
+            await asyncio.sleep(0)
+
+    async def demo():
+        data = [3, 1, 5, 12, 2, 11, 7, 9]
+        async for snapshot in aiter_k_largest_snapshots(numbers(data), 3, snapshot_every=4):
+            print(snapshot)
+        # 出力:
+        # TopKSnapshot(count=4, top=[12, 5, 3])
+        # TopKSnapshot(count=8, top=[12, 11, 9])
+
+        print(await async_max_sub_array_of_size_k(3, numbers([2, 1, 5, 1, 3, 2])))  # 出力: 9
+        async for snapshot in aiter_max_window_snapshots(2, numbers([2, 3, 4, 1, 5]), snapshot_every=2):
+            print(snapshot)
+        # 出力:
+        # WindowSnapshot(count=2, max_sum=5, window_sum=5)
+        # WindowSnapshot(count=4, max_sum=7, window_sum=5)
+        # WindowSnapshot(count=5, max_sum=7, window_sum=6)
+
+        # チャンク単位で渡す (abatched で要素のストリームをまとめる)
+        chunks = abatched(numbers(range(100_000)), 10_000)
+        print(await async_find_k_largest_numbers(chunks, 3, chunked=True))  # 出力: [99999, 99998, 99997]
+
+        # 流量が少ないときは max_delay 秒でチャンクを打ち切る
+        async for batch in abatched(numbers([1, 2, 3], delay=0.05), 10, max_delay=0.08):
+            print(batch)
+        # 出力:
+        # [1, 2]
+        # [3]
+
+        # 大きなチャンクでも slice_size 個ごとにイベントループに制御を返す
+        ticks = [0]
+        task = asyncio.ensure_future(heartbeat(ticks))
+
+        async def one_chunk():
+            yield list(range(1_000_000))
+
+        await async_max_sub_array_of_size_k(10, one_chunk(), chunked=True)
+        task.cancel()
+        print(ticks[0] >= 1_000_000 // DEFAULT_SLICE_SIZE)  # 出力: True
+
+    asyncio.run(demo())
@@ -0,0 +1,194 @@
+# coding: utf-8
+"""
+小さな入力を大量に処理するためのバッチ API
+
+level_order_traversal (小さな木)、find_pair_with_target_sum (短い配列)、cyclic_sort (小さな配列) を
+まとめて処理するための API です。各入力について元の関数を1件ずつ呼ぶだけで、呼び出しごとの
+前処理 (計測の確認やバッファの判定) をまとめる仕組みはありません。そのため直列 (executor="serial") は
+単純なループと同じ速さで、速くはなりません (CPython 3.11、入力サイズ 8 の測定では、どの関数も
+ループとの差は測定のばらつきの範囲)。GIL のある CPython では、スレッドやプロセスもこの大きさの
+入力では投入のコストの方が大きく、ループより遅くなります。速くなりうるのは、GIL のない CPython での
+スレッドや、1件あたりの処理が大きい入力でのプロセスです。
+
+処理の方法は次のいずれかで、結果は入力と同じ順のリストで返します。
+- 直列 (executor="serial"): 呼び出し元のスレッドで処理する
+- スレッド (executor="thread"): チャンク単位で ThreadPoolExecutor に投入する。
+  GIL のない (free-threaded) CPython ではコア数に応じて速くなる
+- プロセス (executor="process"): チャンク単位で ProcessPoolExecutor に投入する。
+  投入 (pickle と IPC) のコストをチャンクごとに1回にまとめる
+
+executor="auto" は、GIL のないビルドならスレッド、それ以外ならプロセスを選びます。
+既存の concurrent.futures.Executor を渡すこともできます (ワーカーの起動コストを呼び出し間で共有できる)。
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import starmap
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from cyclic_sort_example import cyclic_sort
+from tree_bfs_example import TreeNode, level_order_traversal
+from two_pointers_example import find_pair_with_target_sum
+
+EXECUTORS = ("serial", "thread", "process", "auto")
+
+
+def gil_enabled() -> bool:
+    """GIL が有効かどうか (free-threaded CPython でなければ常に True)"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _run_chunk(func: Callable[..., Any], chunk: Sequence[Tuple[Any, ...]]) -> List[Any]:
+    # ワーカーで1チャンク分を処理する (モジュールレベルの関数なのでプロセスにも渡せる)
+    return list(starmap(func, chunk))
+
+
+def _sorted_copy(arr):
+    # cyclic_sort はインプレースで並べ替えて None を返すため、プロセスから結果を返すときに使う
+    cyclic_sort(arr)
+    return arr
+
+
+def run_batch(func: Callable[..., Any], args_list: Iterable[Tuple[Any, ...]],
+              executor: Union[str, Executor] = "serial", max_workers: Optional[int] = None,
+              chunk_size: Optional[int] = None, chunks_per_worker: int = 4) -> List[Any]:
+    """
+    func(*args) を args_list の各要素について実行し、結果を入力と同じ順のリストで返します。
+
+    Args:
+        func: 実行する関数 (executor="process" ならモジュールレベルの関数)
+        args_list: 引数のタプルの列
+        executor: "serial" / "thread" / "process" / "auto"、または Executor のインスタンス
+        max_workers: ワーカー数 (省略時は CPU コア数)
+        chunk_size: 1回の投入にまとめる入力の数 (省略時は 入力数 / (ワーカー数 * chunks_per_worker))
+        chunks_per_worker: chunk_size を省略したときの、ワーカーあたりのチャンク数
+
+    Returns:
+        結果のリスト
+    """
+    args_list = args_list if isinstance(args_list, list) else list(args_list)
+    if executor == "auto":
+        executor = "process" if gil_enabled() else "thread"
+    if executor == "serial" or not args_list:
+        return _run_chunk(func, args_list)
+    if isinstance(executor, str) and executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {EXECUTORS} or an Executor, got {executor!r}")
+
+    workers = max_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(args_list) // (workers * chunks_per_worker)))
+    chunks = [args_list[i:i + chunk_size] for i in range(0, len(args_list), chunk_size)]
+
+    if isinstance(executor, Executor):
+        pool, owned = executor, False
+    elif executor == "thread":
+        pool, owned = ThreadPoolExecutor(max_workers=workers), True
+    else:
+        pool, owned = ProcessPoolExecutor(max_workers=workers), True
+    try:
+        results: List[Any] = []
+        # map は投入した順に結果を返すので、結果の順序は入力の順のまま
+        for part in pool.map(_run_chunk, [func] * len(chunks), chunks):
+            results.extend(part)
+        return results
+    finally:
+        if owned:
+            pool.shutdown()
+
+
+def batch_level_order_traversal(roots: Iterable[Optional[TreeNode]], **options) -> List[List[List[int]]]:
+    """
+    複数の木の level_order_traversal をまとめて求めます。options は run_batch と同じです。
+    """
+    return run_batch(level_order_traversal, [(root,) for root in roots], **options)
+
+
+def batch_find_pair_with_target_sum(problems: Iterable[Tuple[Sequence[int], int]],
+                                    **options) -> List[List[int]]:
+    """
+    (ソート済みの配列, target) の列について、find_pair_with_target_sum をまとめて求めます。
+    options は run_batch と同じです。
+    """
+    return run_batch(find_pair_with_target_sum, problems, **options)
+
+
+def batch_cyclic_sort(arrays: Sequence[Any], **options) -> Sequence[Any]:
+    """
+    複数の配列をまとめて循環ソートし、arrays を返します (各配列はインプレースに並べ替えられます)。
+
+    プロセスで処理する場合、ワーカーが並べ替えたのはコピーなので、結果を元の配列に書き戻します。
+    options は run_batch と同じです。
+    """
+    executor = options.get("executor", "serial")
+    if executor == "auto":
+        executor = options["executor"] = "process" if gil_enabled() else "thread"
+    if executor in ("serial", "thread"):
+        run_batch(cyclic_sort, [(arr,) for arr in arrays], **options)
+        return arrays
+    for arr, sorted_arr in zip(arrays, run_batch(_sorted_copy, [(arr,) for arr in arrays], **options)):
+        arr[:] = sorted_arr
+    return arrays
+
+
+def benchmark_batch(n_inputs: int = 100_000, input_size: int = 8,
+                    executors: Sequence[str] = ("serial", "thread", "process"),
+                    max_workers: Optional[int] = None, seed: int = 0,
+                    repeat: int = 3) -> List[Tuple[str, str, float]]:
+    """
+    小さな入力を n_inputs 個処理するスループット (件/秒) を、単純なループと各 executor で比べます。
+    単純なループも、バッチ API と同じく結果をリストに集めます。各方法を repeat 回実行し、最良の値を使います。
+
+    Returns:
+        (関数名, "loop" または executor, 件/秒) のタプルのリスト
+    """
+    import input_generators as gen
+
+    trees = [gen.complete_tree(input_size) for _ in range(n_inputs)]
+    problems = [gen.sorted_array_with_pair(input_size, seed=seed + i) for i in range(n_inputs)]
+    permutations = [gen.random_permutation(input_size, seed=seed + i) for i in range(n_inputs)]
+
+    def plain_loop(func, args_list):
+        results = []
+        for args in args_list:
+            results.append(func(*args))
+        return results
+
+    cases = [
+        ("level_order_traversal", level_order_traversal, lambda: [(t,) for t in trees]),
+        ("find_pair_with_target_sum", find_pair_with_target_sum, lambda: problems),
+        ("cyclic_sort", cyclic_sort, lambda: [(list(p),) for p in permutations]),
+    ]
+    rows = []
+    for name, func, make_args in cases:
+        modes = [("loop", lambda args_list: plain_loop(func, args_list))]
+        for executor in executors:
+            batch_func = _sorted_copy if func is cyclic_sort and executor == "process" else func
+            modes.append((executor, lambda args_list, batch_func=batch_func, executor=executor:
+                          run_batch(batch_func, args_list, executor=executor, max_workers=max_workers)))
+        for mode, run in modes:
+            best = float("inf")
+            for _ in range(repeat):
+                args_list = make_args()  # cyclic_sort は入力を書き換えるので毎回作り直す
+                start = time.perf_counter()
+                run(args_list)
+                best = min(best, time.perf_counter() - start)
+            rows.append((name, mode, n_inputs / best))
+    return rows
+
+
+# --- 実行例 ---
+if __name__ == "__main__":
+    roots = [TreeNode(1, TreeNode(2), TreeNode(3)),
+             TreeNode(3, TreeNode(9), TreeNode(20, TreeNode(15), TreeNode(7)))]
+    print(batch_level_order_traversal(roots))  # 出力: [[[1], [2, 3]], [[3], [9, 20], [15, 7]]]
+    print(batch_find_pair_with_target_sum([([2, 7, 11, 15], 9), ([2, 3, 4], 6)], executor="thread"))
+    # 出力: [[1, 2], [1, 3]]
+    print(batch_cyclic_sort([[3, 1, 2], [2, 4, 1, 3]], executor="process", max_workers=2))
+    # 出力: [[1, 2, 3], [1, 2, 3, 4]]
+
+    print(f"\n--- スループット (入力サイズ 8, CPU コア数: {os.cpu_count()}, GIL: {gil_enabled()}) ---")
+    for name, mode, per_second in benchmark_batch(n_inputs=50_000):
+        print(f"{name:<26} {mode:>7}  {per_second:12,.0f} 件/秒")
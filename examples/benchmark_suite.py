@@ -0,0 +1,424 @@
+# coding: utf-8
+"""
+全サンプルモジュールの公開関数を対象にしたベンチマークスイート
+
+使い方:
+    python benchmark_suite.py                         # 全ベンチマークを実行して表示
+    python benchmark_suite.py --filter tree_dfs       # 名前に tree_dfs を含むものだけ
+    python benchmark_suite.py --save-baseline         # 結果をベースラインとして保存
+    python benchmark_suite.py --baseline benchmark_baseline.json --threshold 0.25
+        # ベースラインより 25% を超えて遅くなったベンチマークがあれば終了コード 1
+    python benchmark_suite.py --instrumentation-overhead
+        # 計測 (instrumentation) が無効なときのオーバーヘッドが、計測のためのコードを取り除いた
+        # 関数と比べて 1% 以下であることを確認
+    python benchmark_suite.py --memory
+        # バッファ (array.array / NumPy 配列) を渡したとき、一時メモリがチャンクごとの上限に収まる
+        # (入力全体のコピーを作らない) ことと、
+        # 結果がリストを渡したときと同じであることを確認
+
+入力は input_generators の乱数シード固定の生成関数で作るため、同じ --size / --seed なら
+毎回同じ入力で計測されます。各ベンチマークは --repeat 回実行し、最小値と中央値を記録します。
+入力を書き換える関数 (cyclic_sort, reverse_linked_list など) は、毎回入力を作り直します
+(入力の生成は計測に含めません)。
+"""
+
+import argparse
+import ast
+import gc
+import inspect
+import json
+import platform
+import random
+import statistics
+import sys
+import textwrap
+import time
+import tracemalloc
+from array import array
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import input_generators as gen
+import instrumentation
+from buffer_views import chunk_size, np
+from cyclic_sort_example import cyclic_sort
+from linked_list_reverse_example import reverse_linked_list
+from sliding_window_example import max_sub_array_of_size_k
+from top_k_elements_example import find_k_frequent_numbers, find_k_largest_numbers
+from tree_bfs_example import level_order_traversal, min_depth, zigzag_level_order
+from tree_dfs_example import (dfs_in_order_iterative, dfs_in_order_recursive,
+                              dfs_post_order_iterative, dfs_post_order_recursive,
+                              dfs_pre_order_iterative, dfs_pre_order_recursive,
+                              path_sum, sum_numbers)
+from two_pointers_example import find_pair_with_target_sum, find_pair_with_target_sum_bst
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable[..., Any]
+    # (size, seed) -> func に渡す引数のタプル
+    setup: Callable[[int, int], Tuple[Any, ...]]
+    # True なら func が入力を書き換えるので、繰り返しのたびに setup し直す
+    mutates: bool = False
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def register(name: str, func: Callable[..., Any], setup: Callable[[int, int], Tuple[Any, ...]],
+             mutates: bool = False) -> None:
+    BENCHMARKS.append(Benchmark(name, func, setup, mutates))
+
+
+# --- ベンチマークの登録 ---
+
+register("sliding_window/max_sub_array_of_size_k", max_sub_array_of_size_k,
+         lambda size, seed: (100, gen.random_int_array(size, seed=seed)))
+register("two_pointers/find_pair_with_target_sum", find_pair_with_target_sum,
+         lambda size, seed: gen.sorted_array_with_pair(size, seed=seed))
+register("two_pointers/find_pair_with_target_sum_bst", find_pair_with_target_sum_bst,
+         lambda size, seed: (gen.balanced_tree(size), size // 2))
+register("top_k/find_k_largest_numbers", find_k_largest_numbers,
+         lambda size, seed: (gen.random_int_array(size, seed=seed), 100))
+register("top_k/find_k_frequent_numbers", find_k_frequent_numbers,
+         lambda size, seed: (gen.zipf_keys(size, seed=seed), 10))
+register("linked_list/reverse_linked_list", reverse_linked_list,
+         lambda size, seed: (gen.linked_list(size),), mutates=True)
+register("cyclic_sort/cyclic_sort", cyclic_sort,
+         lambda size, seed: (gen.random_permutation(size, seed=seed),), mutates=True)
+
+TREE_SHAPES = {
+    "balanced": lambda size, seed: gen.balanced_tree(size),
+    "complete": lambda size, seed: gen.complete_tree(size),
+    "skewed": lambda size, seed: gen.skewed_tree(size, seed=seed),
+}
+
+for _shape, _build in TREE_SHAPES.items():
+    for _func in (level_order_traversal, zigzag_level_order, min_depth,
+                  dfs_pre_order_iterative, dfs_in_order_iterative, dfs_post_order_iterative):
+        _module = "tree_bfs" if _func in (level_order_traversal, zigzag_level_order, min_depth) else "tree_dfs"
+        register(f"{_module}/{_func.__name__}[{_shape}]", _func,
+                 lambda size, seed, _build=_build: (_build(size, seed),))
+
+# 再帰版は歪んだ木だと再帰の深さが木の高さになるため、平衡な木だけで計測する
+for _shape in ("balanced", "complete"):
+    _build = TREE_SHAPES[_shape]
+    for _func in (dfs_pre_order_recursive, dfs_in_order_recursive, dfs_post_order_recursive):
+        register(f"tree_dfs/{_func.__name__}[{_shape}]", _func,
+                 lambda size, seed, _build=_build: (_build(size, seed),))
+    register(f"tree_dfs/sum_numbers[{_shape}]", sum_numbers,
+             lambda size, seed, _build=_build: (_build(size, seed),))
+    register(f"tree_dfs/path_sum[{_shape}]", path_sum,
+             lambda size, seed, _build=_build: (_build(size, seed), size))
+
+# 計測に対応している関数 (instrumentation.py を参照)
+INSTRUMENTED_FUNCTIONS = (find_k_largest_numbers, cyclic_sort, level_order_traversal,
+                          dfs_pre_order_iterative, dfs_in_order_iterative, dfs_post_order_iterative)
+
+# バッファ入力に対応している関数と、その入力 (array.array('q')) の作り方
+BUFFER_INPUTS: Dict[str, Tuple[Callable[..., Any], Callable[[int, int], Tuple[Any, ...]]]] = {
+    "sliding_window/max_sub_array_of_size_k": (
+        max_sub_array_of_size_k,
+        lambda size, seed: (100, array("q", gen.random_int_array(size, seed=seed)))),
+    "two_pointers/find_pair_with_target_sum": (
+        find_pair_with_target_sum,
+        lambda size, seed: (lambda numbers, target: (array("q", numbers), target))(
+            *gen.sorted_array_with_pair(size, seed=seed))),
+    "top_k/find_k_largest_numbers": (
+        find_k_largest_numbers,
+        lambda size, seed: (array("q", gen.random_int_array(size, seed=seed)), 100)),
+    "cyclic_sort/cyclic_sort": (
+        cyclic_sort,
+        lambda size, seed: (array("q", gen.random_permutation(size, seed=seed)),)),
+}
+
+
+# --- 実行と比較 ---
+
+def _time_once(func: Callable[..., Any], args: Tuple[Any, ...]) -> float:
+    gc.collect()
+    gc.disable()  # GC の発生タイミングによるばらつきを避ける
+    try:
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def run_benchmarks(size: int = 100_000, repeat: int = 5, seed: int = 0,
+                   pattern: Optional[str] = None) -> Dict[str, Any]:
+    """
+    登録済みのベンチマークを実行し、JSON に書き出せる辞書を返します。
+
+    Returns:
+        {"meta": {...}, "results": {name: {"min": 秒, "median": 秒, "repeat": 回数}}}
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for bench in BENCHMARKS:
+        if pattern and pattern not in bench.name:
+            continue
+        args = None if bench.mutates else bench.setup(size, seed)
+        times = []
+        for _ in range(repeat):
+            run_args = bench.setup(size, seed) if bench.mutates else args
+            times.append(_time_once(bench.func, run_args))
+        results[bench.name] = {"min": min(times), "median": statistics.median(times),
+                               "repeat": repeat}
+    return {
+        "meta": {
+            "size": size,
+            "seed": seed,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+                        ) -> List[Tuple[str, float, float, float]]:
+    """
+    ベースラインと比べて、最小実行時間が (1 + threshold) 倍を超えたベンチマークを返します。
+
+    Returns:
+        (名前, ベースラインの秒, 今回の秒, 比率) のリスト。空なら回帰なし。
+    """
+    for key in ("size", "seed"):
+        if current["meta"][key] != baseline["meta"][key]:
+            raise ValueError(f"baseline was recorded with {key}={baseline['meta'][key]}, "
+                             f"current run uses {key}={current['meta'][key]}")
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base["min"] <= 0:
+            continue
+        ratio = result["min"] / base["min"]
+        if ratio > 1 + threshold:
+            regressions.append((name, base["min"], result["min"], ratio))
+    return regressions
+
+
+class _StripInstrumentation(ast.NodeTransformer):
+    # 計測のためだけのコードを取り除く。
+    # started = instrumentation.start() の文と、`started is not None` を条件とする if 文を消し、
+    # 条件式 (x if started is not None else y) は y にする
+    stripped = 0
+
+    @staticmethod
+    def _is_guard(test: ast.expr) -> bool:
+        return (isinstance(test, ast.Compare) and isinstance(test.left, ast.Name)
+                and test.left.id == "started" and len(test.ops) == 1
+                and isinstance(test.ops[0], ast.IsNot)
+                and isinstance(test.comparators[0], ast.Constant) and test.comparators[0].value is None)
+
+    def visit_Assign(self, node: ast.Assign) -> Any:
+        if isinstance(node.value, ast.Call) and ast.unparse(node.value.func) == "instrumentation.start":
+            self.stripped += 1
+            return None
+        return self.generic_visit(node)
+
+    def visit_If(self, node: ast.If) -> Any:
+        if self._is_guard(node.test):
+            self.stripped += 1
+            return [self.visit(child) for child in node.orelse]
+        return self.generic_visit(node)
+
+    def visit_IfExp(self, node: ast.IfExp) -> Any:
+        if self._is_guard(node.test):
+            self.stripped += 1
+            return self.visit(node.orelse)
+        return self.generic_visit(node)
+
+
+def without_instrumentation(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    func のソースから計測のためのコード (instrumentation.start() と、その戻り値で分岐する部分) を
+    取り除いて作り直した関数を返します。計測が無効なときのオーバーヘッドを測る比較対象に使います。
+    """
+    transformer = _StripInstrumentation()
+    tree = transformer.visit(ast.parse(textwrap.dedent(inspect.getsource(func))))
+    if not transformer.stripped:
+        raise ValueError(f"{func.__name__} has no instrumentation guard to strip")
+    ast.fix_missing_locations(tree)
+    namespace = dict(func.__globals__)
+    exec(compile(tree, f"<{func.__name__} without instrumentation>", "exec"), namespace)
+    return namespace[func.__name__]
+
+
+def check_instrumentation_overhead(size: int = 100_000, repeat: int = 31, seed: int = 0,
+                                   pattern: Optional[str] = None
+                                   ) -> List[Tuple[str, float, float, float, float]]:
+    """
+    計測に対応している関数について、計測が無効なときのオーバーヘッドを測ります。
+
+    比較対象は、同じ関数から計測のためのコードを取り除いて作り直したもの
+    (without_instrumentation) です。両者を1組としてランダムな順で続けて実行することを repeat 回繰り返し、
+    組ごとの実行時間の比の中央値からオーバーヘッドの割合を求めます。
+    参考として、有効時 (null_sink) との実行時間の比も測ります。
+
+    Returns:
+        (名前, 計測なしの秒, 無効時の秒, 無効時のオーバーヘッドの割合, 有効時/無効時の比) のリスト
+    """
+    order = random.Random(seed)
+    rows = []
+    for bench in BENCHMARKS:
+        if bench.func not in INSTRUMENTED_FUNCTIONS or (pattern and pattern not in bench.name):
+            continue
+        baseline_func = without_instrumentation(bench.func)
+        baseline, disabled, enabled, ratios = [], [], [], []
+        args = None if bench.mutates else bench.setup(size, seed)
+        for round_number in range(repeat + 1):
+            # 計測なし・無効の組を、順番をランダムに入れ替えながら続けて実行し、組ごとの比を取る
+            # (実行環境の揺らぎは組の中ではほぼ共通なので、比の中央値は揺らぎに強い)
+            pair = [(baseline_func, baseline), (bench.func, disabled)]
+            order.shuffle(pair)
+            elapsed = {}
+            for func, times in pair:
+                elapsed[id(times)] = _time_once(func, bench.setup(size, seed) if bench.mutates else args)
+            if round_number:  # 1回目はウォームアップとして捨てる
+                baseline.append(elapsed[id(baseline)])
+                disabled.append(elapsed[id(disabled)])
+                ratios.append(elapsed[id(disabled)] / elapsed[id(baseline)])
+        with instrumentation.instrument(instrumentation.null_sink):
+            for _ in range(max(1, repeat // 4)):
+                enabled.append(_time_once(bench.func, bench.setup(size, seed) if bench.mutates else args))
+        rows.append((bench.name, min(baseline), min(disabled), statistics.median(ratios) - 1,
+                     min(enabled) / min(disabled)))
+    return rows
+
+
+def _is_buffer(value: Any) -> bool:
+    return isinstance(value, array) or (np is not None and isinstance(value, np.ndarray))
+
+
+def _outcome(result: Any, args: Tuple[Any, ...]) -> Tuple[Any, List[Any]]:
+    # 戻り値と、インプレースに書き換えられた引数 (cyclic_sort) をまとめて比べられる形にする。
+    # find_k_largest_numbers は実装によって順序が違うので、リストの戻り値は並べ替えて比べる
+    normalized = sorted(result) if isinstance(result, list) else result
+    return normalized, [a.tolist() if _is_buffer(a) else a for a in args]
+
+
+def check_memory(size: int = 100_000, seed: int = 0, pattern: Optional[str] = None,
+                 max_chunk_buffers: float = 10, slack: int = 16 * 1024
+                 ) -> List[Tuple[str, int, int, int, bool]]:
+    """
+    バッファ入力に対応している関数について、呼び出し中に新たに確保されたメモリのピークを
+    tracemalloc で測り、チャンクごとの一時配列の上限と比べます。
+    上限は「1チャンク分の int64 配列 (chunk_size(n) * 8 バイト) を max_chunk_buffers 個」に、
+    NumPy のオブジェクトなどの固定の確保分 slack バイトを足したものです。
+    一時配列の大きさは入力の大きさの 1 / CHUNK_DIVISOR 以下なので、入力全体をコピーすれば
+    (size が NUMPY_MIN_SIZE 程度の小さな入力でも) この上限を超えます。
+    NumPy があれば、同じ入力を NumPy 配列にしたもの ([ndarray]) も測ります。
+
+    あわせて、結果が同じ入力をリストで渡したとき (リスト版の実装) と一致するかを確かめます。
+    size が NUMPY_MIN_SIZE 以上で NumPy があれば、NumPy による処理 (searchsorted によるペア探索、
+    cumsum によるウィンドウ和、partition による上位 K 個) の結果を確かめることになります。
+
+    Returns:
+        (名前, 入力のバイト数, 確保されたメモリのピーク, 許容する上限, 結果が一致したか) のリスト
+    """
+    rows = []
+    for name, (func, setup) in BUFFER_INPUTS.items():
+        if pattern and pattern not in name:
+            continue
+        variants = [(f"{name}[array]", lambda args: args)]
+        if np is not None:
+            variants.append((f"{name}[ndarray]",
+                             lambda args: tuple(np.asarray(a) if isinstance(a, array) else a for a in args)))
+        for label, convert in variants:
+            args = convert(setup(size, seed))
+            list_args = tuple(a.tolist() if _is_buffer(a) else a for a in args)
+            expected = _outcome(func(*list_args), list_args)
+            nbytes = sum(a.nbytes if np is not None and isinstance(a, np.ndarray)
+                         else len(a) * a.itemsize for a in args if _is_buffer(a))
+            n = max(len(a) for a in args if _is_buffer(a))
+            limit = int(max_chunk_buffers * chunk_size(n) * 8) + slack
+            gc.collect()
+            tracemalloc.start()
+            try:
+                result = func(*args)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            rows.append((label, nbytes, peak, limit, _outcome(result, args) == expected))
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--size", type=int, default=100_000, help="入力サイズ (要素数 / ノード数)")
+    parser.add_argument("--repeat", type=int,
+                        help="各ベンチマークの繰り返し回数 (既定: 5。--instrumentation-overhead では 31)")
+    parser.add_argument("--seed", type=int, default=0, help="入力生成の乱数シード")
+    parser.add_argument("--filter", dest="pattern", help="名前にこの文字列を含むものだけ実行")
+    parser.add_argument("--output", help="結果を書き出す JSON ファイル")
+    parser.add_argument("--baseline", help="比較するベースラインの JSON ファイル")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help=f"結果をベースラインとして保存 (既定: {DEFAULT_BASELINE})")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="回帰とみなす遅延の割合 (0.25 = 25%% 遅くなったら失敗)")
+    parser.add_argument("--instrumentation-overhead", action="store_true",
+                        help="計測が無効なときのオーバーヘッドを確認する")
+    parser.add_argument("--max-overhead", type=float, default=0.01,
+                        help="計測が無効なときに許容するオーバーヘッドの割合 (既定: 0.01 = 1%%)")
+    parser.add_argument("--memory", action="store_true",
+                        help="バッファを渡したときに入力全体のコピーを作らないことを確認する")
+    parser.add_argument("--max-chunk-buffers", type=float, default=10,
+                        help="許容する一時メモリを、1チャンク分の int64 配列の個数で指定 (既定: 10)")
+    parser.add_argument("--memory-slack", type=int, default=16,
+                        help="一時メモリの上限に足す固定の確保分 (KiB、既定: 16)")
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        rows = check_memory(args.size, args.seed, args.pattern,
+                            args.max_chunk_buffers, args.memory_slack * 1024)
+        width = max((len(row[0]) for row in rows), default=0)
+        failed = False
+        for name, nbytes, peak, limit, matches in rows:
+            print(f"{name:<{width}}  input {nbytes / 1024:10.1f} KiB  "
+                  f"peak {peak / 1024:10.1f} KiB  limit {limit / 1024:10.1f} KiB"
+                  f"{'' if matches else '  RESULT MISMATCH'}")
+            failed = failed or peak > limit or not matches
+        return 1 if failed else 0
+
+    if args.instrumentation_overhead:
+        rows = check_instrumentation_overhead(args.size, args.repeat or 31, args.seed, args.pattern)
+        width = max((len(row[0]) for row in rows), default=0)
+        failed = False
+        for name, baseline, seconds, overhead, enabled_ratio in rows:
+            print(f"{name:<{width}}  stripped {baseline * 1000:9.3f} ms  disabled {seconds * 1000:9.3f} ms  "
+                  f"overhead {overhead:+.2%}  enabled {enabled_ratio:.2f}x")
+            failed = failed or overhead > args.max_overhead
+        return 1 if failed else 0
+
+    # --save-baseline が --baseline と同じファイルを指しても、書き換える前の内容と比べる
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = run_benchmarks(args.size, args.repeat or 5, args.seed, args.pattern)
+    width = max((len(name) for name in report["results"]), default=0)
+    for name, result in report["results"].items():
+        print(f"{name:<{width}}  min {result['min'] * 1000:9.3f} ms  "
+              f"median {result['median'] * 1000:9.3f} ms")
+
+    regressions = []
+    if baseline is not None:
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        for name, base, current, ratio in regressions:
+            print(f"REGRESSION {name}: {base * 1000:.3f} ms -> {current * 1000:.3f} ms "
+                  f"({ratio:.2f}x)", file=sys.stderr)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# coding: utf-8
+"""
+バッファプロトコルに対応した入力 (array.array, bytes, bytearray, memoryview, NumPy 配列など) を
+コピーせずに扱うための共通処理
+
+max_sub_array_of_size_k / find_pair_with_target_sum / find_k_largest_numbers / cyclic_sort は、
+入力が連続した数値のバッファなら numeric_view() で1次元の memoryview にし、
+- NumPy があり、要素数が NUMPY_MIN_SIZE 以上なら、as_ndarray() でゼロコピーの ndarray にして
+  chunk_size() 個ずつのチャンクごとにベクトル化した処理を行い、
+- そうでなければ memoryview を直接読みます。
+どちらの場合も入力全体のコピー (list(...) や np.array(...)) は作りません。
+リストやタプルなど、バッファでないシーケンスはこれまでどおりの実装で処理します。
+"""
+
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy は任意。なければ memoryview による実装だけを使う
+    np = None
+
+# struct 形式の文字のうち、数値として扱うもの
+NUMERIC_FORMATS = frozenset("bBhHiIlLqQfd")
+INTEGER_FORMATS = frozenset("bBhHiIlLqQ")
+
+# これより短い入力では、NumPy の呼び出しのオーバーヘッドの方が大きい
+NUMPY_MIN_SIZE = 4096
+
+# NumPy による処理で一度に扱う要素数 (一時配列の大きさの上限)
+CHUNK_SIZE = 1 << 13
+
+# 1チャンクの要素数は入力の要素数の 1 / CHUNK_DIVISOR 以下にする (MIN_CHUNK_SIZE は下回らない)。
+# 一時配列をいくつか作っても、入力全体のコピーより十分小さく収まるように
+CHUNK_DIVISOR = 32
+MIN_CHUNK_SIZE = 128
+
+INT64_MAX = (1 << 63) - 1
+
+
+def numeric_view(obj) -> Optional[memoryview]:
+    """
+    obj が C 連続の数値のバッファなら、それをコピーせずに1次元の memoryview として返します。
+    それ以外 (リスト、タプル、文字列、数値以外の形式など) なら None を返します。
+    """
+    if isinstance(obj, (list, tuple, str)):  # よくある入力はバッファの確認を省く
+        return None
+    try:
+        view = obj if isinstance(obj, memoryview) else memoryview(obj)
+    except TypeError:
+        return None
+    fmt = view.format.lstrip("@=")  # ネイティブのバイトオーダーを表す接頭辞だけを許す
+    if fmt not in NUMERIC_FORMATS or not view.c_contiguous:
+        return None
+    if view.ndim != 1 or fmt != view.format:
+        view = view.cast("B").cast(fmt)
+    return view
+
+
+def as_ndarray(view: memoryview):
+    """
+    NumPy による処理に向いていれば、view と同じメモリを指す ndarray を返します (コピーなし)。
+    NumPy がない場合や、要素数が NUMPY_MIN_SIZE 未満の場合は None を返します。
+    """
+    if np is None or len(view) < NUMPY_MIN_SIZE:
+        return None
+    return np.asarray(view)
+
+
+def chunk_size(n: int) -> int:
+    """要素数 n の入力を NumPy でチャンクごとに処理するときの、1チャンクの要素数"""
+    return max(MIN_CHUNK_SIZE, min(CHUNK_SIZE, n // CHUNK_DIVISOR))
+
+
+def is_integer(view: memoryview) -> bool:
+    """view の要素が整数かどうか"""
+    return view.format in INTEGER_FORMATS
+
+
+def abs_bound(values) -> int:
+    """ndarray の要素の絶対値の最大値 (Python の int / float)"""
+    return max(abs(values.min().item()), abs(values.max().item()))
@@ -1,10 +1,31 @@
+import time
+from array import array, typecodes
+from typing import List, NamedTuple
+
+import instrumentation
+from buffer_views import numeric_view
+
+try:
+    import numpy as np
+except ImportError:  # NumPy は任意。なければ memoryview による実装だけを使う
+    np = None
+
+
 def cyclic_sort(arr):
     """
     循環ソートの例
 
     Args:
-        arr (list): ソート対象の配列
+        arr (list): ソート対象の配列。array.array や NumPy 配列などの書き込み可能なバッファも、
+            リストに変換せずに memoryview 経由でインプレースに並べ替えます
+            (NumPy 配列の要素を直接読み書きするより、memoryview の方が速い)。
     """
+    started = instrumentation.start()
+    view = numeric_view(arr)
+    if view is not None:
+        arr = _writable_view(view)
+    if started is not None:
+        arr = instrumentation.CountingSequence(arr)  # 同じループのまま書き込み回数を数える
     n = len(arr)
     i = 0
     while i < n:
@@ -16,6 +37,11 @@ def cyclic_sort(arr):
             # 要素が正しい位置にある場合、次の要素へ
             i += 1
 
+    if started is not None:
+        # 1回の交換で2回書き込む。ループの各反復で比較を1回行い、反復は i を進める n 回と交換の回数
+        swaps = arr.writes // 2
+        instrumentation.emit("cyclic_sort", started, {"swaps": swaps, "comparisons": n + swaps}, 0)
+
     # アルゴリズムの説明:
     # 1. 配列を先頭から走査します。
     # 2. 各要素について、その要素が正しい位置にあるかどうかを確認します。
@@ -29,15 +55,283 @@ def cyclic_sort(arr):
     # 各要素は最大で1回しか交換されないため、全体の計算量はO(n)となります。
     # 最悪の場合でも、各要素は正しい位置に移動するまでにn回の交換が必要となることはありません。
 
-# 例
-arr = [3, 5, 2, 1, 4]
-cyclic_sort(arr)
-print(arr)  # 出力: [1, 2, 3, 4, 5]
+class CyclicSortReport(NamedTuple):
+    """cyclic_sort_report の結果"""
+    missing: List[int]  # 1..n のうち配列に現れなかった数 (昇順)
+    duplicates: List[int]  # 1..n のうち2回以上現れた数 (各1回。並べ替えた後の配列で2つ目が現れる位置の順)
+    first_missing_positive: int  # 配列に現れない最小の正の整数
+
+
+def cyclic_sort_report(arr):
+    """
+    「ほぼ順列」の配列を循環ソートし、欠けている数・重複している数・最小の欠けている正の整数を報告します。
+
+    cyclic_sort と同じ交換ループを使いますが、1..n の範囲外の値 (0 以下や n より大きい値) は
+    交換せずにその場に残すため、IndexError になりません。交換後は、範囲内の値 v はすべて
+    インデックス v-1 に置かれます (重複した値の2つ目以降は、空いている位置に残ります)。
+
+    Args:
+        arr (list): 整数の配列 (インプレースで並べ替えられます)
+
+    Returns:
+        CyclicSortReport: missing / duplicates / first_missing_positive
+
+    例:
+        arr = [3, 1, 3, 7, -2]
+        cyclic_sort_report(arr)
+        # => CyclicSortReport(missing=[2, 4, 5], duplicates=[3], first_missing_positive=2)
+        # arr は [1, 3, 3, 7, -2] のように、値 v が位置 v-1 に置かれた状態になる
+
+    duplicates は、並べ替えた後の配列で重複した値 (2つ目以降) が現れる位置の順に並びます
+    (昇順とは限りません)。重複を集めるのに集合や並べ替えは使いません。
+
+    計算量: O(n)
+        各交換で少なくとも1つの値が正しい位置に確定し、以後は動かないため、交換は最大 n 回です。
+        報告のための走査は線形走査2回です。
+    空間計算量: O(1) (結果のリストを除く)
+    """
+    n = len(arr)
+    i = 0
+    while i < n:
+        value = arr[i]
+        # 範囲内の値で、正しい位置にまだ同じ値がなければ交換する
+        # (正しい位置に同じ値があれば重複なので、交換すると無限ループになる)
+        if 1 <= value <= n and arr[value - 1] != value:
+            arr[i], arr[value - 1] = arr[value - 1], value
+        else:
+            # 正しい位置にある値、範囲外の値、重複した値は、その場に残して次へ
+            i += 1
+
+    # 位置 i に i+1 がなければ i+1 は欠けている
+    missing = [i + 1 for i in range(n) if arr[i] != i + 1]
+
+    # 正しい位置でない位置 i に範囲内の値 v があれば、位置 v-1 は既に v で埋まっているので v は重複している。
+    # 同じ v を2回報告しないよう、報告した v の位置 v-1 に一時的に -v を書いて印を付ける
+    # (-v は範囲外なので、その位置を後で読んでも重複とはみなされない)
+    duplicates = []
+    for i in range(n):
+        value = arr[i]
+        if value != i + 1 and 1 <= value <= n and arr[value - 1] == value:
+            duplicates.append(value)
+            arr[value - 1] = -value
+    for value in duplicates:  # 印を元に戻す
+        arr[value - 1] = value
+
+    first_missing_positive = missing[0] if missing else n + 1
+    return CyclicSortReport(missing, duplicates, first_missing_positive)
+
+
+def _writable_view(buf):
+    # array.array / bytearray / NumPy 配列 / memoryview などを、コピーせずに1次元の memoryview として扱う
+    view = buf if isinstance(buf, memoryview) else memoryview(buf)
+    if view.readonly:
+        raise TypeError("buffer must be writable")
+    if view.ndim != 1:
+        view = view.cast("B").cast(view.format)
+    return view
+
+
+def _empty_like(view):
+    # view と同じ型・長さのゼロ埋めバッファを作る (array.array で表せない形式はリストにする)
+    if view.format in typecodes:
+        return array(view.format, bytes(view.nbytes))
+    return [0] * len(view)
+
+
+def cyclic_sort_buffer(buf):
+    """
+    書き込み可能なバッファ (array.array, NumPy 配列, bytearray, memoryview など) 上で
+    1..n の順列をインプレースに循環ソートします。
+
+    cyclic_sort と同じ交換ループですが、Python のリストに変換せずに memoryview 経由で
+    直接読み書きするため、要素ごとの int オブジェクトを保持し続けることがなく、
+    10^8 要素の int32 配列でもメモリは 400MB のままです。
+
+    Args:
+        buf: 1..n の値を格納した書き込み可能なバッファ。重複があってもよく、
+            cyclic_sort と同じく、正しい位置が既に同じ値で埋まっている値はその場に残します
+
+    Returns:
+        int: 行った交換の回数 (順列なら n - 巡回置換の個数)
+
+    Raises:
+        ValueError: 1..n の範囲外の値がある場合 (それまでに行った交換は元に戻しません)
+
+    計算量: O(n)
+    空間計算量: O(1)
+    """
+    view = _writable_view(buf)
+    n = len(view)
+    swaps = 0
+    for i in range(n):
+        # 位置 i に正しい値 (i+1) が来るまで、現在の値を正しい位置へ送り出す
+        value = view[i]
+        while value != i + 1:
+            if not 1 <= value <= n:
+                raise ValueError(f"value {value} at index {i} is outside 1..{n}")
+            displaced = view[value - 1]
+            if displaced == value:
+                break  # 重複している値。正しい位置は既に埋まっているので、その場に残す
+            view[value - 1] = value
+            view[i] = displaced
+            value = displaced
+            swaps += 1
+    return swaps
+
+
+def cyclic_sort_scatter(arr, out=None):
+    """
+    追加のバッファを使える場合の、ベクトル化された循環ソート (out[arr - 1] = arr)。
+
+    NumPy 配列なら1回のファンシーインデックス代入で済み、Python のループを使いません。
+    それ以外のバッファやシーケンスでは、同じ代入を memoryview 上のループで行います。
+
+    Args:
+        arr: 1..n の順列 (NumPy 配列、バッファ、またはシーケンス)。変更されません。
+        out: 結果を書き込むバッファ (省略時は arr と同じ型で新しく確保)
+
+    Returns:
+        ソート済みの配列 (out)
+
+    計算量: O(n)
+    空間計算量: O(n) (out の分)
+    """
+    if np is not None and isinstance(arr, np.ndarray):
+        if out is None:
+            out = np.empty_like(arr)
+        out[arr - 1] = arr
+        return out
+
+    try:
+        values = memoryview(arr)
+    except TypeError:
+        values = arr  # list などのシーケンス
+    if out is None:
+        out = _empty_like(values) if isinstance(values, memoryview) else [0] * len(values)
+    for value in values:
+        out[value - 1] = value
+    return out
+
+
+def inverse_permutation(perm):
+    """
+    1..n の順列 perm の逆置換 inv (inv[perm[i] - 1] = i + 1) を返します。
+
+    NumPy 配列ならベクトル化された代入1回、それ以外は1回の線形走査です。
+
+    計算量: O(n)
+    空間計算量: O(n)
+    """
+    n = len(perm)
+    if np is not None and isinstance(perm, np.ndarray):
+        inv = np.empty_like(perm)
+        inv[perm - 1] = np.arange(1, n + 1, dtype=perm.dtype)
+        return inv
+
+    try:
+        inv = _empty_like(memoryview(perm))
+    except TypeError:
+        inv = [0] * n
+    for i, value in enumerate(perm):
+        inv[value - 1] = i + 1
+    return inv
+
+
+def permutation_cycles(perm):
+    """
+    1..n の順列 perm を巡回置換に分解します。
+    各巡回は位置 (1 始まり) の列で、位置 p の次は perm[p - 1] です。
+
+    巡回置換の個数を c とすると、循環ソートの交換回数はちょうど n - c 回になります。
+
+    例:
+        permutation_cycles([3, 5, 2, 1, 4])  # => [[1, 3, 2, 5, 4]]
+        permutation_cycles([2, 1, 3])        # => [[1, 2], [3]]
+
+    計算量: O(n)
+    空間計算量: O(n) (訪問済みフラグは1要素1バイトの bytearray)
+    """
+    n = len(perm)
+    visited = bytearray(n)
+    cycles = []
+    for start in range(n):
+        if visited[start]:
+            continue
+        cycle = []
+        position = start
+        while not visited[position]:
+            visited[position] = 1
+            cycle.append(position + 1)
+            position = perm[position] - 1
+        cycles.append(cycle)
+    return cycles
+
+
+def benchmark_cyclic_sort(n=1_000_000, seed=0):
+    """
+    リスト版 cyclic_sort と、バッファ版・スキャッタ版の実行時間 (秒) を比較します。
+    入力は同じ乱数順列で、各実装にはそのコピーを渡します (コピーは計測に含めません)。
+
+    Returns:
+        list[tuple[str, float]]: (実装名, 秒) のリスト
+    """
+    import random
+
+    rng = random.Random(seed)
+    perm = list(range(1, n + 1))
+    rng.shuffle(perm)
+
+    cases = [
+        ("cyclic_sort (list)", lambda: list(perm), cyclic_sort),
+        ("cyclic_sort_buffer (array 'i')", lambda: array("i", perm), cyclic_sort_buffer),
+        ("cyclic_sort_scatter (array 'i')", lambda: array("i", perm), cyclic_sort_scatter),
+    ]
+    if np is not None:
+        cases += [
+            ("cyclic_sort_buffer (numpy int32)", lambda: np.array(perm, dtype=np.int32), cyclic_sort_buffer),
+            ("cyclic_sort_scatter (numpy int32)", lambda: np.array(perm, dtype=np.int32), cyclic_sort_scatter),
+        ]
+
+    results = []
+    for name, setup, run in cases:
+        data = setup()
+        start = time.perf_counter()
+        run(data)
+        results.append((name, time.perf_counter() - start))
+    return results
+
+if __name__ == "__main__":
+    # 例
+    arr = [3, 5, 2, 1, 4]
+    cyclic_sort(arr)
+    print(arr)  # 出力: [1, 2, 3, 4, 5]
+
+    arr = [5, 4, 3, 2, 1]
+    cyclic_sort(arr)
+    print(arr)
+
+    arr = [1, 2, 3, 4, 5]
+    cyclic_sort(arr)
+    print(arr)
+
+    # ほぼ順列の配列
+    arr = [3, 1, 3, 7, -2]
+    print(cyclic_sort_report(arr))  # 出力: CyclicSortReport(missing=[2, 4, 5], duplicates=[3], first_missing_positive=2)
+    print(arr)  # 出力: [1, 3, 3, 7, -2]
+
+    arr = [2, 3, 1, 2, 2, 6]
+    print(cyclic_sort_report(arr))  # 出力: CyclicSortReport(missing=[4, 5], duplicates=[2], first_missing_positive=4)
+
+    arr = [1, 2, 3]
+    print(cyclic_sort_report(arr))  # 出力: CyclicSortReport(missing=[], duplicates=[], first_missing_positive=4)
 
-arr = [5, 4, 3, 2, 1]
-cyclic_sort(arr)
-print(arr)
+    # バッファ上の循環ソート
+    buf = array("i", [3, 5, 2, 1, 4])
+    print(cyclic_sort_buffer(buf), buf.tolist())  # 出力: 4 [1, 2, 3, 4, 5]
+    print(cyclic_sort_scatter(array("i", [3, 5, 2, 1, 4])).tolist())  # 出力: [1, 2, 3, 4, 5]
+    print(inverse_permutation([3, 5, 2, 1, 4]))  # 出力: [4, 3, 1, 5, 2]
+    print(permutation_cycles([3, 5, 2, 1, 4]))  # 出力: [[1, 3, 2, 5, 4]]
 
-arr = [1, 2, 3, 4, 5]
-cyclic_sort(arr)
-print(arr)
+    print("\nBenchmark (n=1000000):")
+    for name, seconds in benchmark_cyclic_sort():
+        print(f"  {name:<34} {seconds:.3f}s")
@@ -0,0 +1,166 @@
+import mmap
+import os
+import tempfile
+from array import array
+
+"""
+外部メモリ版の循環ソート (External-memory Cyclic Sort)
+
+cyclic_sort は値 v を位置 v-1 へ交換していくため、アクセスはほぼランダムです。
+RAM に収まらない順列ファイルを mmap して同じことをすると、
+ほとんどすべての交換でページフォールトが起き、ディスクのランダムアクセスになります。
+
+そこで、交換の代わりに「値の行き先のブロック」で振り分けます。
+1. 分配パス: 入力を先頭から順に読み、各値 v を行き先ブロック (v-1) // block_items ごとの
+   一時ファイル (バケット) に追記します。同時に開くバケット数が max_open_buckets を
+   超える場合は、バケットのグループごとに入力を読み直します。
+2. 確認パス: ファイルに書き込む前に、各バケットに重複がないことを確かめます
+   (順列でない入力ではファイルを一切変更しません)。
+3. 書き戻しパス: ブロックを先頭から順に処理し、バケットを読み込んでメモリ上のブロックに
+   block[v - 1 - start] = v と配置してから、ファイルの該当範囲にまとめて書き込みます。
+
+どちらのパスも読み書きはほぼシーケンシャルで、メモリ使用量は
+O(block_items + max_open_buckets * バッファサイズ) に抑えられます。
+結果は、ファイル全体をメモリに読み込んで cyclic_sort した場合と同じです。
+"""
+
+
+def cyclic_sort_file(path, typecode="i", block_items=1 << 20, max_open_buckets=64,
+                     buffer_items=1 << 14, tmp_dir=None):
+    """
+    固定幅の整数 (ネイティブのバイトオーダー) で 1..n の順列を格納したファイルを、
+    インプレースで循環ソートします。
+
+    Args:
+        path (str): 順列ファイルのパス
+        typecode (str): 要素の型 (array モジュールの型コード。例: "i" = int32, "q" = int64)
+        block_items (int): 書き戻しパスで1度にメモリに載せる要素数
+        max_open_buckets (int): 分配パスで同時に開くバケットファイル数の上限
+        buffer_items (int): バケットごとの書き込みバッファの要素数
+        tmp_dir (str | None): バケットファイルを置くディレクトリ (省略時はシステムの一時ディレクトリ)
+
+    Returns:
+        int: 要素数 n
+
+    Raises:
+        ValueError: ファイルサイズが要素幅の倍数でない、または 1..n の順列でない場合。
+                    範囲外の値・各ブロックの要素数・重複はすべて書き戻しの前に確認するため、
+                    この例外が送出されたときファイルは変更されていません。
+
+    計算量: O(n) (入力の読み込みは ceil(ブロック数 / max_open_buckets) 回、
+            バケットの書き込みと出力の書き込みは各1回、バケットの読み込みは
+            重複の確認と書き戻しで2回。すべてシーケンシャル)
+    空間計算量: O(block_items + max_open_buckets * buffer_items) のメモリと、
+                ファイルと同じサイズの一時ディスク領域
+    """
+    itemsize = array(typecode).itemsize
+    size = os.path.getsize(path)
+    if size % itemsize:
+        raise ValueError(f"file size {size} is not a multiple of item size {itemsize}")
+    n = size // itemsize
+    if n == 0:
+        return 0
+
+    num_blocks = -(-n // block_items)  # 切り上げ除算
+    chunk_bytes = block_items * itemsize
+
+    with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm, \
+            tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        bucket_paths = [os.path.join(tmp, f"bucket_{b}.bin") for b in range(num_blocks)]
+        counts = [0] * num_blocks
+
+        # 1. 分配パス: バケットのグループごとに入力を先頭から読み直す
+        for group_start in range(0, num_blocks, max_open_buckets):
+            group_end = min(group_start + max_open_buckets, num_blocks)
+            files = [open(bucket_paths[b], "wb") for b in range(group_start, group_end)]
+            buffers = [array(typecode) for _ in files]
+            try:
+                for offset in range(0, size, chunk_bytes):
+                    chunk = array(typecode)
+                    chunk.frombytes(mm[offset:offset + chunk_bytes])
+                    for value in chunk:
+                        if not 1 <= value <= n:
+                            raise ValueError(f"value {value} is out of range 1..{n}")
+                        block = (value - 1) // block_items
+                        if group_start <= block < group_end:
+                            buffer = buffers[block - group_start]
+                            buffer.append(value)
+                            if len(buffer) >= buffer_items:
+                                buffer.tofile(files[block - group_start])
+                                del buffer[:]
+                for block, (buffer, bucket) in enumerate(zip(buffers, files), group_start):
+                    buffer.tofile(bucket)
+                    counts[block] = bucket.tell() // itemsize
+            finally:
+                for bucket in files:
+                    bucket.close()
+
+        # 順列なら、各ブロックに行く値の個数はちょうどブロックの長さになる
+        for block, count in enumerate(counts):
+            expected = min(block_items, n - block * block_items)
+            if count != expected:
+                raise ValueError(f"not a permutation of 1..{n}: block {block} receives "
+                                 f"{count} values, expected {expected}")
+
+        # 重複の確認: ファイルに書き込む前に、すべてのバケットを読んで確かめる
+        # (途中のブロックで重複が見つかっても、それまでのブロックが書き換わっていないように)
+        for block, bucket_path in enumerate(bucket_paths):
+            start = block * block_items
+            seen = bytearray(counts[block])
+            for values in _read_bucket(bucket_path, typecode, counts[block], buffer_items):
+                for value in values:
+                    if seen[value - 1 - start]:
+                        raise ValueError(f"not a permutation of 1..{n}: duplicate value {value}")
+                    seen[value - 1 - start] = 1
+
+        # 2. 書き戻しパス: ブロックごとにメモリ上で配置し、先頭から順に書き込む
+        for block, bucket_path in enumerate(bucket_paths):
+            start = block * block_items
+            length = counts[block]
+            placed = array(typecode, bytes(length * itemsize))  # 0 で初期化
+            for values in _read_bucket(bucket_path, typecode, length, buffer_items):
+                for value in values:
+                    placed[value - 1 - start] = value
+            os.remove(bucket_path)
+            mm[start * itemsize:(start + length) * itemsize] = placed.tobytes()
+        mm.flush()
+    return n
+
+
+def _read_bucket(bucket_path, typecode, count, buffer_items):
+    # バケットファイルの count 個の値を、最大 buffer_items 個ずつの array として返す
+    with open(bucket_path, "rb") as bucket:
+        while count > 0:
+            values = array(typecode)
+            values.fromfile(bucket, min(buffer_items, count))
+            count -= len(values)
+            yield values
+
+
+# --- 実行例 ---
+if __name__ == "__main__":
+    import random
+
+    from cyclic_sort_example import cyclic_sort
+
+    n = 100_000
+    perm = list(range(1, n + 1))
+    random.Random(0).shuffle(perm)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "perm.bin")
+        with open(path, "wb") as f:
+            array("i", perm).tofile(f)
+
+        # ブロックを小さくして、複数ブロック・複数グループの分配を試す
+        cyclic_sort_file(path, "i", block_items=4096, max_open_buckets=8)
+
+        result = array("i")
+        with open(path, "rb") as f:
+            result.fromfile(f, n)
+
+    expected = list(perm)
+    cyclic_sort(expected)
+    print("In-memory cyclic_sort と一致:", result.tolist() == expected)  # 出力: True
+    print("先頭:", result[:5].tolist(), "末尾:", result[-5:].tolist())
+    # 出力: 先頭: [1, 2, 3, 4, 5] 末尾: [99996, 99997, 99998, 99999, 100000]
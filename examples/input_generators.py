@@ -0,0 +1,115 @@
+# coding: utf-8
+"""
+ベンチマーク用の入力生成 (乱数シード固定)
+
+各関数は seed を受け取り、同じ引数なら常に同じ入力を返します。
+木は再帰を使わずに構築するため、深い (歪んだ) 木でも RecursionError になりません。
+"""
+
+import bisect
+import itertools
+import random
+from typing import List, Optional, Tuple
+
+from linked_list_reverse_example import Node, build_linked_list
+from tree_bfs_example import TreeNode
+
+
+# --- 配列 ---
+
+def random_int_array(n: int, low: int = -10**6, high: int = 10**6, seed: int = 0) -> List[int]:
+    """[low, high] の一様乱数 n 個のリスト"""
+    rng = random.Random(seed)
+    return [rng.randint(low, high) for _ in range(n)]
+
+
+def sorted_array_with_pair(n: int, seed: int = 0) -> Tuple[List[int], int]:
+    """
+    find_pair_with_target_sum 用に、(昇順の配列, 解がちょうど1つだけ存在するターゲット) を返します。
+    解のペアは配列の中ほどに置くため、2つのポインタは両端からそれぞれ約 n/2 回移動します。
+    """
+    rng = random.Random(seed)
+    # 相異なる偶数を並べ、中ほどの1つだけを奇数にすると、
+    # 和が奇数のターゲットになるペアはその奇数を含む1組だけになる
+    numbers = sorted(2 * v for v in rng.sample(range(-10**9, 10**9), n))
+    i, j = n // 2 - 1, n // 2
+    numbers[j] += 1
+    return numbers, numbers[i] + numbers[j]
+
+
+def random_permutation(n: int, seed: int = 0) -> List[int]:
+    """1..n の乱数順列"""
+    perm = list(range(1, n + 1))
+    random.Random(seed).shuffle(perm)
+    return perm
+
+
+def zipf_keys(n: int, num_keys: int = 10_000, exponent: float = 1.1, seed: int = 0) -> List[int]:
+    """
+    Zipf 分布 (キー k の出現確率が 1 / k^exponent に比例) に従うキー n 個のリスト。
+    キーは 1..num_keys で、小さいキーほど頻出します。
+    """
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1.0 / k ** exponent for k in range(1, num_keys + 1)))
+    total = cum_weights[-1]
+    return [bisect.bisect_left(cum_weights, rng.random() * total) + 1 for _ in range(n)]
+
+
+# --- 連結リスト ---
+
+def linked_list(n: int) -> Optional[Node]:
+    """値 1..n の連結リスト"""
+    return build_linked_list(range(1, n + 1))
+
+
+# --- 木 ---
+
+def complete_tree(n: int) -> Optional[TreeNode]:
+    """値 0..n-1 をレベル順に並べた完全二分木"""
+    nodes = [TreeNode(v) for v in range(n)]
+    for i, node in enumerate(nodes):
+        if 2 * i + 1 < n:
+            node.left = nodes[2 * i + 1]
+        if 2 * i + 2 < n:
+            node.right = nodes[2 * i + 2]
+    return nodes[0] if nodes else None
+
+
+def balanced_tree(n: int) -> Optional[TreeNode]:
+    """値 0..n-1 の高さ平衡な二分探索木 (中間順に走査すると 0..n-1 になる)"""
+    if n <= 0:
+        return None
+    root = TreeNode((n - 1) // 2)
+    # (ノード, そのノードが担当する範囲 [lo, hi]) のスタック
+    stack = [(root, 0, n - 1)]
+    while stack:
+        node, lo, hi = stack.pop()
+        mid = node.val
+        if lo <= mid - 1:
+            node.left = TreeNode((lo + mid - 1) // 2)
+            stack.append((node.left, lo, mid - 1))
+        if mid + 1 <= hi:
+            node.right = TreeNode((mid + 1 + hi) // 2)
+            stack.append((node.right, mid + 1, hi))
+    return root
+
+
+def skewed_tree(n: int, seed: Optional[int] = None) -> Optional[TreeNode]:
+    """
+    高さ n の歪んだ木 (各ノードが子を1つだけ持つ)。
+    seed が None なら右にだけ伸びる鎖、指定すると左右を乱数で選びます。
+    値は 0..n-1 です。
+    """
+    if n <= 0:
+        return None
+    rng = random.Random(seed) if seed is not None else None
+    root = TreeNode(0)
+    node = root
+    for v in range(1, n):
+        child = TreeNode(v)
+        if rng is not None and rng.random() < 0.5:
+            node.left = child
+        else:
+            node.right = child
+        node = child
+    return root
@@ -0,0 +1,217 @@
+# coding: utf-8
+"""
+ホットパスの計測 (オプトイン)
+
+本番で関数が遅くなったときに「なぜ遅いのか」を調べるための計測機能です。
+有効にすると、対応している関数は呼び出しごとに以下を記録し、シンクに渡します。
+- 操作回数 (ヒープの pushpop 回数、交換回数、訪問ノード数など)
+- 補助メモリのピーク (キュー・スタック・ヒープに同時に入った要素数の最大値)
+- 実行時間 (wall time)
+
+対応している関数:
+- top_k_elements_example.find_k_largest_numbers
+- cyclic_sort_example.cyclic_sort
+- tree_bfs_example.level_order_traversal
+- tree_dfs_example.dfs_pre_order_iterative / dfs_in_order_iterative / dfs_post_order_iterative
+
+有効化の方法:
+    with instrument() as sink:          # 既定では ListSink に記録
+        find_k_largest_numbers(nums, 3)
+    print(sink.records)
+
+    with instrument(JsonLinesSink(open("trace.jsonl", "w"))):
+        ...
+
+    環境変数 PRACTICE_INSTRUMENT=1 を設定すると、インポート時から標準エラー出力に
+    JSON Lines で記録されます。
+
+計測付きの別の実装は持たず、本番と同じコード (バッファや NumPy の経路を含む) を通ります。
+各関数は先頭で start() を呼び、有効なときだけ、スタックやキューを PeakList / PeakDeque に、
+インプレースで並べ替える配列を CountingSequence に、ヒープ操作の関数を CountingCall に差し替えて、同じループのまま最大の要素数や
+書き込み回数を数えます。ループの外で求められる値 (訪問ノード数など) は最後にまとめて求めます。
+そのため、有効なときは差し替えたオブジェクトの分だけ遅くなりますが、無効なときに増えるのは
+start() の呼び出しと、最後の `started is not None` の確認だけです。
+無効なときのオーバーヘッドは `python benchmark_suite.py --instrumentation-overhead` で、
+計測のための文を取り除いて作り直した関数との実行時間の差として確認できます。
+
+active_sink はプロセス全体で共有されるため、スレッドごとに別のシンクを使うことはできません。
+"""
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+ENV_FLAG = "PRACTICE_INSTRUMENT"
+
+Record = Dict[str, Any]
+Sink = Callable[[Record], None]
+
+# 計測が有効なときだけ None 以外になる。各関数はこれだけを確認する
+active_sink: Optional[Sink] = None
+
+
+class ListSink:
+    """記録をメモリ上のリストに溜めるシンク"""
+
+    def __init__(self) -> None:
+        self.records: List[Record] = []
+
+    def __call__(self, record: Record) -> None:
+        self.records.append(record)
+
+
+class JsonLinesSink:
+    """記録を1行1件の JSON としてストリームに書き出すシンク"""
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream if stream is not None else sys.stderr
+
+    def __call__(self, record: Record) -> None:
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def null_sink(record: Record) -> None:
+    """記録を捨てるシンク (計測そのもののコストを測るときに使う)"""
+
+
+def start() -> Optional[float]:
+    """
+    計測が有効なら開始時刻 (time.perf_counter() の値) を、無効なら None を返します。
+    対応している関数は先頭でこれを呼び、戻り値が None でなければ最後に emit() を呼びます。
+    """
+    return time.perf_counter() if active_sink is not None else None
+
+
+def emit(function: str, started: float, counts: Dict[str, int], peak_aux: int) -> None:
+    """
+    計測している関数の最後で呼び出し、1回分の記録をシンクに渡します。
+
+    Args:
+        function: 関数名
+        started: 呼び出し開始時の time.perf_counter() の値
+        counts: 操作回数
+        peak_aux: 補助データ構造に同時に入った要素数の最大値
+    """
+    elapsed = time.perf_counter() - started
+    sink = active_sink
+    if sink is not None:
+        sink({"function": function, "wall_time": elapsed, "counts": counts, "peak_aux": peak_aux})
+
+
+class PeakList(list):
+    """append のたびに要素数の最大値 (peak) を記録するリスト (スタックの計測用)"""
+
+    def __init__(self, iterable: Iterable[Any] = ()) -> None:
+        super().__init__(iterable)
+        self.peak = len(self)
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        if len(self) > self.peak:
+            self.peak = len(self)
+
+
+class PeakDeque(deque):
+    """append のたびに要素数の最大値 (peak) を記録する deque (キューの計測用)"""
+
+    def __init__(self, iterable: Iterable[Any] = ()) -> None:
+        super().__init__(iterable)
+        self.peak = len(self)
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        if len(self) > self.peak:
+            self.peak = len(self)
+
+
+class CountingSequence:
+    """読み書きを seq にそのまま委ね、書き込み回数 (writes) を数えるシーケンス"""
+
+    __slots__ = ("seq", "writes")
+
+    def __init__(self, seq: Any) -> None:
+        self.seq = seq
+        self.writes = 0
+
+    def __len__(self) -> int:
+        return len(self.seq)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.seq[index]
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        self.seq[index] = value
+        self.writes += 1
+
+
+class CountingCall:
+    """呼び出しを func にそのまま委ね、呼び出し回数 (calls) を数える呼び出し可能オブジェクト"""
+
+    __slots__ = ("func", "calls")
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args: Any) -> Any:
+        self.calls += 1
+        return self.func(*args)
+
+
+@contextmanager
+def instrument(sink: Optional[Sink] = None) -> Iterator[Sink]:
+    """
+    with ブロックの間だけ計測を有効にします。ブロックを抜けると元の状態に戻ります。
+
+    Args:
+        sink: 記録を受け取る呼び出し可能オブジェクト (省略時は新しい ListSink)
+
+    Yields:
+        使用しているシンク
+    """
+    global active_sink
+    if sink is None:
+        sink = ListSink()
+    previous = active_sink
+    active_sink = sink
+    try:
+        yield sink
+    finally:
+        active_sink = previous
+
+
+if os.environ.get(ENV_FLAG, "") not in ("", "0"):
+    active_sink = JsonLinesSink()
+
+
+# --- 実行例 ---
+if __name__ == "__main__":
+    # スクリプトとして実行すると、このファイルは __main__ と instrumentation の2つのモジュールになる。
+    # 各関数が参照するのは instrumentation の方なので、そちらを使う
+    import instrumentation
+    from cyclic_sort_example import cyclic_sort
+    from top_k_elements_example import find_k_largest_numbers
+    from tree_bfs_example import TreeNode, level_order_traversal
+    from tree_dfs_example import dfs_pre_order_iterative
+
+    root = TreeNode(3, TreeNode(9), TreeNode(20, TreeNode(15), TreeNode(7)))
+    with instrumentation.instrument() as sink:
+        find_k_largest_numbers([3, 1, 5, 12, 2, 11], 3)
+        cyclic_sort([3, 5, 2, 1, 4])
+        level_order_traversal(root)
+        dfs_pre_order_iterative(root)
+    for record in sink.records:
+        print(record["function"], record["counts"], "peak_aux =", record["peak_aux"])
+    # 出力:
+    # find_k_largest_numbers {'scanned': 6, 'pushes': 3, 'pushpops': 2} peak_aux = 3
+    # cyclic_sort {'swaps': 4, 'comparisons': 9} peak_aux = 0
+    # level_order_traversal {'visited': 5, 'levels': 3} peak_aux = 2
+    # dfs_pre_order_iterative {'visited': 5} peak_aux = 2
+
+    # with ブロックの外では何も記録されない
+    cyclic_sort([2, 1])
+    print(len(sink.records))  # 出力: 4
@@ -1,17 +1,391 @@
+from array import array
+from collections import deque
+
 class Node:
+    # __dict__ を持たせないことで、ノードあたりのメモリと属性アクセスのコストを抑える
+    __slots__ = ("value", "next")
+
     def __init__(self, value):
         self.value = value
         self.next = None
 
+def build_linked_list(iterable):
+    """
+    イテラブルの要素から Node の連結リストを作る関数
+
+    引数:
+    iterable: 要素の並び
+
+    戻り値:
+    Node: 連結リストの先頭ノード (空の場合は None)
+    """
+    dummy = Node(None)
+    tail = dummy
+    for value in iterable:
+        tail.next = Node(value)
+        tail = tail.next
+    return dummy.next
+
+def linked_list_to_list(head):
+    """
+    Node の連結リストの値を Python のリストに変換する関数
+    """
+    result = []
+    while head is not None:
+        result.append(head.value)
+        head = head.next
+    return result
+
+NIL = -1  # ArrayLinkedList で「次のノードがない」ことを表すインデックス
+
+class ArrayLinkedList:
+    """
+    配列ベースの単方向連結リスト
+
+    ノードはオブジェクトではなく「スロット番号」で表し、値と次のスロットを
+    2つの整数配列 value / next に並べて持ちます。削除されたスロットは
+    next を使って繋いだフリーリストに戻し、次の挿入で再利用します。
+
+    Node を使う場合に比べて、ノードあたりのメモリは 16 バイト (int64 × 2) で済み、
+    from_iterable / to_list は配列の一括変換で行えます。
+
+    リストがスロット 0, 1, 2, ... の順 (またはその逆順) に連続して並んでいる間は
+    その状態を覚えておき、反転を配列の一括生成 (ベクトル化された付け替え) で行います。
+    """
+
+    def __init__(self):
+        self.value = array("q")
+        self.next = array("q")
+        self.head = NIL
+        self._free = NIL  # フリーリストの先頭スロット
+        self._size = 0
+        # 1: スロットが昇順に連続, -1: 降順に連続, 0: 一般の配置
+        self._layout = 0
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """
+        イテラブルからリストを一括で作る
+
+        時間計算量: O(n)  # 配列の一括生成のみで、ノードごとの Python オブジェクトは作らない
+        """
+        lst = cls()
+        lst.value = array("q", iterable)
+        n = len(lst.value)
+        lst.next = array("q", range(1, n + 1))
+        if n:
+            lst.next[n - 1] = NIL
+            lst.head = 0
+            lst._layout = 1
+        lst._size = n
+        return lst
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        value, next_ = self.value, self.next
+        slot = self.head
+        while slot != NIL:
+            yield value[slot]
+            slot = next_[slot]
+
+    def to_list(self):
+        """
+        リストの値を先頭から順に Python のリストとして返す
+
+        時間計算量: O(n)  # 連続配置なら配列の一括変換、そうでなければリンクを辿る
+        """
+        if self._layout == 1:
+            return self.value.tolist()
+        if self._layout == -1:
+            return self.value[::-1].tolist()
+        return list(self)
+
+    def _alloc(self, value):
+        self._layout = 0
+        slot = self._free
+        if slot != NIL:
+            self._free = self.next[slot]
+            self.value[slot] = value
+        else:
+            slot = len(self.value)
+            self.value.append(value)
+            self.next.append(NIL)
+        self._size += 1
+        return slot
+
+    def _release(self, slot):
+        self._layout = 0
+        self.next[slot] = self._free
+        self._free = slot
+        self._size -= 1
+
+    def push_front(self, value):
+        """先頭に値を追加し、そのスロット番号を返す。時間計算量: O(1)"""
+        slot = self._alloc(value)
+        self.next[slot] = self.head
+        self.head = slot
+        return slot
+
+    def insert_after(self, slot, value):
+        """スロット slot の直後に値を追加し、そのスロット番号を返す。時間計算量: O(1)"""
+        new_slot = self._alloc(value)
+        self.next[new_slot] = self.next[slot]
+        self.next[slot] = new_slot
+        return new_slot
+
+    def pop_front(self):
+        """先頭の値を取り除いて返す。時間計算量: O(1)"""
+        slot = self.head
+        if slot == NIL:
+            raise IndexError("pop from empty list")
+        self.head = self.next[slot]
+        self._release(slot)
+        return self.value[slot]
+
+    def remove_after(self, slot):
+        """スロット slot の直後のノードを取り除いてその値を返す。時間計算量: O(1)"""
+        target = self.next[slot]
+        if target == NIL:
+            raise IndexError("no node after the given slot")
+        self.next[slot] = self.next[target]
+        self._release(target)
+        return self.value[target]
+
+    def reverse(self):
+        """
+        リストをインプレースで反転する
+
+        時間計算量: O(n)
+        - 連続配置の場合は next 配列を range から一括生成する (C レベルの処理のみ)
+        - それ以外は reverse_linked_list と同じ付け替えをスロット番号で行う
+        空間計算量: O(1)  # 連続配置の場合は next 配列の作り直しに O(n)
+        """
+        n = self._size
+        if self._layout == 1:
+            # 0 -> 1 -> ... -> n-1 を n-1 -> ... -> 1 -> 0 に付け替える
+            self.next = array("q", range(-1, n - 1))
+            self.head = n - 1
+            self._layout = -1
+            return
+        if self._layout == -1:
+            self.next = array("q", range(1, n + 1))
+            self.next[n - 1] = NIL
+            self.head = 0
+            self._layout = 1
+            return
+
+        next_ = self.next
+        prev = NIL
+        current = self.head
+        while current != NIL:
+            next_slot = next_[current]
+            next_[current] = prev
+            prev = current
+            current = next_slot
+        self.head = prev
+
+    def reverse_between(self, p, q):
+        """
+        p 番目から q 番目 (1 始まり、両端を含む) のノードをインプレースで反転する
+        アルゴリズムは関数 reverse_between と同じで、ノードの代わりにスロット番号を使う。
+
+        時間計算量: O(q)  # 1 回の走査
+        空間計算量: O(1)
+        """
+        if p < 1:
+            raise ValueError("p must be >= 1")
+        if p >= q:
+            return
+        next_ = self.next
+        before = NIL  # 反転区間の直前のスロット (NIL なら区間は先頭から)
+        first = self.head
+        for _ in range(p - 1):
+            if first == NIL:
+                return
+            before, first = first, next_[first]
+        if first == NIL:
+            return
+
+        self._layout = 0
+        # first は反転後に区間の末尾になる。その直後のノードを区間の先頭へ順に移していく
+        for _ in range(q - p):
+            moved = next_[first]
+            if moved == NIL:
+                break
+            next_[first] = next_[moved]
+            if before == NIL:
+                next_[moved] = self.head
+                self.head = moved
+            else:
+                next_[moved] = next_[before]
+                next_[before] = moved
+
+    def reverse_k_group(self, k):
+        """
+        先頭から k 個ずつのグループごとにインプレースで反転する
+        (末尾の k 個に満たないグループはそのまま)。
+        アルゴリズムは関数 reverse_k_group と同じで、ノードの代わりにスロット番号を使う。
+
+        時間計算量: O(n)  # 1 回の走査 (末尾の端数グループのみ 2 回)
+        空間計算量: O(1)
+        """
+        if k <= 1 or self.head == NIL:
+            return
+        self._layout = 0
+        next_ = self.next
+        before = NIL  # 直前のグループの末尾スロット
+        current = self.head
+        while current != NIL:
+            group_first = current
+            prev = NIL
+            count = 0
+            while current != NIL and count < k:
+                next_slot = next_[current]
+                next_[current] = prev
+                prev = current
+                current = next_slot
+                count += 1
+
+            if count < k:
+                # 端数グループは元の順序に戻す
+                undo_prev = NIL
+                while prev != NIL:
+                    next_slot = next_[prev]
+                    next_[prev] = undo_prev
+                    undo_prev = prev
+                    prev = next_slot
+                prev = undo_prev
+
+            if before == NIL:
+                self.head = prev
+            else:
+                next_[before] = prev
+            if count < k:
+                return
+            next_[group_first] = current
+            before = group_first
+
+class _Block:
+    # ReversibleList の 1 ブロック。items は要素のリストで、reversed が True なら後ろから読む
+    __slots__ = ("items", "reversed")
+
+    def __init__(self, items, reversed_=False):
+        self.items = items
+        self.reversed = reversed_
+
+class ReversibleList:
+    """
+    論理的な反転を O(1) で行えるアンロールドリスト (Unrolled Linked List)
+
+    要素を最大 block_size 個ずつの Python のリスト (ブロック) に詰め、ブロックを deque で繋ぎます。
+    - リスト全体に反転フラグ _reversed を持ち、reverse() はこれを反転するだけです。
+    - 各ブロックにも反転フラグを持ち、splice() で別のリストを繋ぐときは、
+      要素ではなくブロックのフラグと並び順だけを調整します。
+    ブロックは任意のオブジェクトを入れられるリストで、連続して並ぶのは要素への参照です
+    (数値そのものが並ぶ array ではありません)。それでも、要素ごとにノードのオブジェクトを作らず、
+    走査で辿るのは block_size 個に1回のブロックの切り替えだけになります。
+
+    ブロックの実際の読み出し方向は block.reversed ^ self._reversed で決まります。
+
+    計算量:
+    - reverse(): O(1)
+    - append(): O(1)
+    - splice(other): O(other のブロック数)
+    - 走査: O(n)
+    """
+
+    def __init__(self, iterable=(), block_size=64):
+        if block_size < 1:
+            raise ValueError("block_size must be >= 1")
+        self._blocks = deque()
+        self._reversed = False
+        self._size = 0
+        self._block_size = block_size
+        self.extend(iterable)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        # 論理順に並んだブロックを、それぞれの実際の方向で読む
+        blocks = reversed(self._blocks) if self._reversed else self._blocks
+        for block in blocks:
+            if block.reversed ^ self._reversed:
+                yield from reversed(block.items)
+            else:
+                yield from block.items
+
+    def __reversed__(self):
+        blocks = self._blocks if self._reversed else reversed(self._blocks)
+        for block in blocks:
+            if block.reversed ^ self._reversed:
+                yield from block.items
+            else:
+                yield from reversed(block.items)
+
+    def to_list(self):
+        return list(self)
+
+    def reverse(self):
+        """リストを論理的に反転する。要素には一切触れない。時間計算量: O(1)"""
+        self._reversed = not self._reversed
+
+    def append(self, value):
+        """論理的な末尾に値を追加する。時間計算量: O(1)"""
+        # 論理的な末尾のブロックは、反転中なら物理的に先頭のブロック
+        if self._blocks:
+            tail = self._blocks[0] if self._reversed else self._blocks[-1]
+            # 読み出し方向が順方向のブロックなら、items の末尾が論理的な末尾
+            if not (tail.reversed ^ self._reversed) and len(tail.items) < self._block_size:
+                tail.items.append(value)
+                self._size += 1
+                return
+        self._push_block(_Block([value], self._reversed))
+        self._size += 1
+
+    def extend(self, iterable):
+        for value in iterable:
+            self.append(value)
+
+    def splice(self, other):
+        """
+        other の全要素を (other の論理順で) このリストの末尾に移す。other は空になる。
+        要素はコピーせず、ブロックの付け替えとフラグの調整だけで行う。
+
+        時間計算量: O(other のブロック数)
+        """
+        if other is self:
+            raise ValueError("cannot splice a list into itself")
+        blocks = reversed(other._blocks) if other._reversed else other._blocks
+        for block in blocks:
+            # other での読み出し方向を、このリストでも保つようにフラグを付け直す
+            block.reversed = block.reversed ^ other._reversed ^ self._reversed
+            self._push_block(block)
+        self._size += other._size
+        other._blocks = deque()
+        other._size = 0
+
+    def _push_block(self, block):
+        # 論理的な末尾にブロックを追加する
+        if self._reversed:
+            self._blocks.appendleft(block)
+        else:
+            self._blocks.append(block)
+
 def reverse_linked_list(head):
     """
     連結リストをインプレースで反転する関数
 
     引数:
-    head (Node): 連結リストの先頭ノード
+    head (Node | ArrayLinkedList | ReversibleList): 連結リストの先頭ノード、
+        または配列ベースの連結リスト / 論理反転できるリスト
 
     戻り値:
-    Node: 反転された連結リストの先頭ノード
+    Node | ArrayLinkedList | ReversibleList: 反転された連結リストの先頭ノード
+        (ArrayLinkedList / ReversibleList を渡した場合は、反転済みの同じリスト。
+         ReversibleList の反転は O(1))
 
     例:
     入力: 1 -> 2 -> 3 -> 4 -> 5 -> None
@@ -21,6 +395,10 @@ def reverse_linked_list(head):
     空間計算量: O(1)  # 定数空間。追加のデータ構造を使用しないため
 
     """
+    if isinstance(head, (ArrayLinkedList, ReversibleList)):
+        head.reverse()
+        return head
+
     prev = None
     current = head
     while(current is not None):
@@ -30,6 +408,165 @@ def reverse_linked_list(head):
         current = next_node
     return prev
 
+def reverse_between(head, p, q):
+    """
+    連結リストの p 番目から q 番目 (1 始まり、両端を含む) のノードをインプレースで反転する関数
+
+    引数:
+    head (Node | ArrayLinkedList): 連結リストの先頭ノード、または配列ベースの連結リスト
+    p (int): 反転する区間の開始位置 (1 以上)
+    q (int): 反転する区間の終了位置。リストの長さを超える場合は末尾までを反転する
+
+    戻り値:
+    Node | ArrayLinkedList: 先頭ノード (ArrayLinkedList を渡した場合は同じリスト)
+
+    例:
+    入力: 1 -> 2 -> 3 -> 4 -> 5 -> None, p=2, q=4
+    出力: 1 -> 4 -> 3 -> 2 -> 5 -> None
+
+    時間計算量: O(q)  # 区間の終わりまで一度だけ走査する
+    空間計算量: O(1)  # リストを分割・結合せず、ポインタの付け替えだけで行う
+
+    アルゴリズム:
+    1. 区間の直前のノード before まで進む。
+    2. 区間の先頭ノード first は反転後に区間の末尾になる。
+    3. first の直後のノードを取り外して before の直後に差し込む操作を q - p 回繰り返す。
+    """
+    if isinstance(head, ArrayLinkedList):
+        head.reverse_between(p, q)
+        return head
+    if p < 1:
+        raise ValueError("p must be >= 1")
+    if head is None or p >= q:
+        return head
+
+    before = None  # 区間の直前のノード (None なら区間は先頭から)
+    first = head
+    for _ in range(p - 1):
+        if first is None:
+            return head
+        before, first = first, first.next
+    if first is None:
+        return head
+
+    for _ in range(q - p):
+        moved = first.next
+        if moved is None:
+            break
+        first.next = moved.next
+        if before is None:
+            moved.next = head
+            head = moved
+        else:
+            moved.next = before.next
+            before.next = moved
+    return head
+
+def reverse_k_group(head, k):
+    """
+    連結リストを先頭から k 個ずつのグループに分け、各グループをインプレースで反転する関数
+    末尾の k 個に満たないグループは元の順序のまま残す。
+
+    引数:
+    head (Node | ArrayLinkedList): 連結リストの先頭ノード、または配列ベースの連結リスト
+    k (int): グループのサイズ
+
+    戻り値:
+    Node | ArrayLinkedList: 先頭ノード (ArrayLinkedList を渡した場合は同じリスト)
+
+    例:
+    入力: 1 -> 2 -> 3 -> 4 -> 5 -> None, k=2
+    出力: 2 -> 1 -> 4 -> 3 -> 5 -> None
+
+    時間計算量: O(n)  # 一度だけ走査する。端数グループだけは反転を元に戻すため 2 回触れる
+    空間計算量: O(1)
+
+    アルゴリズム:
+    1. グループの先頭から最大 k 個を reverse_linked_list と同じ要領で反転する。
+    2. k 個に満たずにリストが終わった場合は、その端数グループを反転し直して元に戻す。
+    3. 直前のグループの末尾を、反転したグループの新しい先頭に繋ぐ。
+    """
+    if isinstance(head, ArrayLinkedList):
+        head.reverse_k_group(k)
+        return head
+    if k <= 1 or head is None:
+        return head
+
+    new_head = None
+    before = None  # 直前のグループの末尾ノード
+    current = head
+    while current is not None:
+        group_first = current  # 反転後にグループの末尾になる
+        prev = None
+        count = 0
+        while current is not None and count < k:
+            next_node = current.next
+            current.next = prev
+            prev = current
+            current = next_node
+            count += 1
+
+        if count < k:
+            # 端数グループは元の順序に戻す
+            prev = reverse_linked_list(prev)
+
+        if before is None:
+            new_head = prev
+        else:
+            before.next = prev
+        if count < k:
+            break
+        group_first.next = current
+        before = group_first
+    return new_head
+
+def _naive_reverse_between(head, p, q):
+    # 比較用: Python のリストに分割し、反転してから連結リストに組み直す
+    values = linked_list_to_list(head)
+    values[p - 1:q] = values[p - 1:q][::-1]
+    return build_linked_list(values)
+
+def _naive_reverse_k_group(head, k):
+    # 比較用: Python のリストに分割し、グループごとに反転してから組み直す
+    values = linked_list_to_list(head)
+    for start in range(0, len(values) - k + 1, k):
+        values[start:start + k] = values[start:start + k][::-1]
+    return build_linked_list(values)
+
+def benchmark_reversal(n=200_000, k=8, repeat=3):
+    """
+    インプレース版 (Node / ArrayLinkedList) と、分割・反転・結合による素朴な実装の
+    実行時間 (秒、repeat 回の最小値) を比較する関数
+
+    戻り値:
+    list[tuple[str, float]]: (実装名, 秒) のリスト
+    """
+    import timeit
+
+    p, q = n // 4, 3 * n // 4
+    cases = [
+        ("reverse_between (Node, in-place)",
+         lambda: build_linked_list(range(n)), lambda h: reverse_between(h, p, q)),
+        ("reverse_between (ArrayLinkedList)",
+         lambda: ArrayLinkedList.from_iterable(range(n)), lambda h: reverse_between(h, p, q)),
+        ("reverse_between (naive split/join)",
+         lambda: build_linked_list(range(n)), lambda h: _naive_reverse_between(h, p, q)),
+        ("reverse_k_group (Node, in-place)",
+         lambda: build_linked_list(range(n)), lambda h: reverse_k_group(h, k)),
+        ("reverse_k_group (ArrayLinkedList)",
+         lambda: ArrayLinkedList.from_iterable(range(n)), lambda h: reverse_k_group(h, k)),
+        ("reverse_k_group (naive split/join)",
+         lambda: build_linked_list(range(n)), lambda h: _naive_reverse_k_group(h, k)),
+    ]
+    results = []
+    for name, setup, run in cases:
+        times = []
+        for _ in range(repeat):
+            head = setup()  # リストの構築は計測に含めない
+            times.append(timeit.timeit(lambda: run(head), number=1))
+        results.append((name, min(times)))
+    return results
+
 # Example Usage:
 if __name__ == "__main__":
     # Create a linked list: 1 -> 2 -> 3 -> 4 -> 5 -> None
@@ -57,3 +594,36 @@ if __name__ == "__main__":
         print(current.value, end=" -> ")
         current = current.next
     print("None")
+
+    # 配列ベースの連結リスト
+    array_list = ArrayLinkedList.from_iterable(range(1, 6))
+    print("\nArray-backed Linked List:", array_list.to_list())  # [1, 2, 3, 4, 5]
+    reverse_linked_list(array_list)  # 連続配置なので一括で付け替え
+    print("Reversed:", array_list.to_list())  # [5, 4, 3, 2, 1]
+    array_list.pop_front()
+    array_list.push_front(6)
+    reverse_linked_list(array_list)  # 一般の配置なのでリンクを辿って付け替え
+    print("Pop 5, push 6, reverse:", array_list.to_list())  # [1, 2, 3, 4, 6]
+
+    # 部分反転と k 個ずつの反転
+    print("\nReverse between 2 and 4:",
+          linked_list_to_list(reverse_between(build_linked_list([1, 2, 3, 4, 5]), 2, 4)))  # [1, 4, 3, 2, 5]
+    print("Reverse k-group (k=2):",
+          linked_list_to_list(reverse_k_group(build_linked_list([1, 2, 3, 4, 5]), 2)))  # [2, 1, 4, 3, 5]
+    print("Reverse k-group (k=3, array):",
+          reverse_k_group(ArrayLinkedList.from_iterable([1, 2, 3, 4, 5, 6, 7, 8]), 3).to_list())  # [3, 2, 1, 6, 5, 4, 7, 8]
+
+    # 論理反転できるリスト
+    lazy = ReversibleList([1, 2, 3], block_size=2)
+    reverse_linked_list(lazy)  # O(1)
+    lazy.append(0)
+    other = ReversibleList([4, 5, 6], block_size=2)
+    other.reverse()
+    lazy.splice(other)
+    print("\nReversibleList:", lazy.to_list())  # [3, 2, 1, 0, 6, 5, 4]
+    lazy.reverse()
+    print("Reversed again:", lazy.to_list())  # [4, 5, 6, 0, 1, 2, 3]
+
+    print("\nBenchmark (n=200000, k=8):")
+    for name, seconds in benchmark_reversal():
+        print(f"  {name:<36} {seconds:.4f}s")
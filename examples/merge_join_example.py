@@ -0,0 +1,239 @@
+# coding: utf-8
+"""
+2つのソート済みソースにまたがるペア探索 (ストリーミングの Two Pointers / マージ結合)
+
+find_pair_with_target_sum は1つのメモリ上のソート済みリストの中でペアを探します。
+ここでは、ソート済みのソース A と B (大きなファイルやイテレータ) から
+    a + b == target  (tolerance を指定すると |a + b - target| <= tolerance)
+となる (a, b) をすべて探します。
+
+Two Pointers と同じく、A を小さい方から、B を大きい方から読みます。
+a が大きくなるほど相方 b の範囲 [target - tolerance - a, target + tolerance - a] は小さい方へ
+ずれていくので、B も一方向に1回読むだけで済みます。ファイルの B は、末尾からチャンク単位で
+シークして逆順に読みます (read_sorted_numbers(path, reverse=True))。
+
+メモリに保持するのは、現在の a に対する相方の候補範囲に入っている B の値だけです
+(tolerance = 0 なら同じ値の重複分だけ)。複数のターゲットをまとめて渡すと、
+1回の読み込みで全ターゲットのペアを探します。このとき保持する B の値は、
+幅 (最大のターゲット - 最小のターゲット + 2 * tolerance) の範囲に入るものです。
+
+結果はジェネレータで1件ずつ返すため、必要な分だけ読んで止めることもできます。
+"""
+
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+Number = Union[int, float]
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class MergeJoinMatch(NamedTuple):
+    """merge_join が返す1件のペア"""
+    target: Number
+    a: Number
+    b: Number
+
+
+# --- ソート済みファイルの読み込み ---
+
+def _iter_lines_reversed(f, chunk_size: int) -> Iterator[bytes]:
+    # ファイルの末尾からチャンク単位でシークして読み、行を後ろから順に返す
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    tail = b""  # 前のチャンクの先頭にあった、まだ行頭が見つかっていない部分
+    while position > 0:
+        size = min(chunk_size, position)
+        position -= size
+        f.seek(position)
+        lines = (f.read(size) + tail).split(b"\n")
+        tail = lines[0]
+        for line in reversed(lines[1:]):
+            yield line
+    yield tail
+
+
+def _iter_binary_chunks(f, typecode: str, chunk_size: int, reverse: bool) -> Iterator[array]:
+    itemsize = array(typecode).itemsize
+    chunk_bytes = max(itemsize, chunk_size - chunk_size % itemsize)
+    f.seek(0, os.SEEK_END)
+    total = f.tell()
+    if total % itemsize:
+        raise ValueError(f"file size {total} is not a multiple of the item size {itemsize}")
+    starts = range(0, total, chunk_bytes)
+    for start in (reversed(starts) if reverse else starts):
+        f.seek(start)
+        chunk = array(typecode)
+        chunk.frombytes(f.read(min(chunk_bytes, total - start)))
+        if reverse:
+            chunk.reverse()
+        yield chunk
+
+
+def read_sorted_numbers(path: str, reverse: bool = False, typecode: Optional[str] = None,
+                        parse: Callable[[str], Number] = int,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Number]:
+    """
+    ソート済みの数値ファイルを先頭から、または末尾から逆順に読みます。
+
+    Args:
+        path: ファイルのパス
+        reverse: True なら末尾から逆順に読む (チャンク単位でシークするので、ファイル全体は読み込まない)
+        typecode: 指定するとバイナリ (array の型コードの固定幅の数値) として読む。
+            省略時はテキスト (空白または改行区切り) として読む
+        parse: テキストの1つの値を数値に変換する関数 (既定: int)
+        chunk_size: 1回に読むバイト数
+
+    Yields:
+        数値 (reverse=True なら逆順)
+
+    空間計算量: O(chunk_size)
+    """
+    if typecode is not None:
+        with open(path, "rb") as f:
+            for chunk in _iter_binary_chunks(f, typecode, chunk_size, reverse):
+                yield from chunk
+        return
+
+    with open(path, "rb") as f:
+        if reverse:
+            for line in _iter_lines_reversed(f, chunk_size):
+                for token in reversed(line.split()):
+                    yield parse(token.decode("ascii"))
+        else:
+            for line in f:
+                for token in line.split():
+                    yield parse(token.decode("ascii"))
+
+
+# --- マージ結合 ---
+
+def merge_join(a_ascending: Iterable[Number], b_descending: Iterable[Number],
+               targets: Sequence[Number], tolerance: Number = 0) -> Iterator[MergeJoinMatch]:
+    """
+    昇順の A と降順の B から、a + b がいずれかのターゲットから tolerance 以内になる
+    ペアをすべて返します。
+
+    Args:
+        a_ascending: 昇順に並んだ A の値
+        b_descending: 降順に並んだ B の値 (ファイルなら read_sorted_numbers(path, reverse=True))
+        targets: ターゲットの列 (1つでもよい)
+        tolerance: 許容する誤差 (0 以上)。0 なら a + b == target のペアだけ
+
+    Yields:
+        MergeJoinMatch(target, a, b)。a の昇順に、同じ a の中では targets の順、
+        同じターゲットの中では b の降順に返す
+
+    Raises:
+        ValueError: A が昇順でない、B が降順でない、tolerance が負の場合
+
+    時間計算量: O(|A| + |B| + |A| * len(targets) * log W + 出力の件数)
+        W は保持している B の値の数
+    空間計算量: O(W)
+    """
+    if tolerance < 0:
+        raise ValueError("tolerance must be non-negative")
+    targets = list(targets)
+    if not targets:
+        return
+    low_target, high_target = min(targets), max(targets)
+
+    b_iter = iter(b_descending)
+    # 相方の候補になりうる B の値を、符号を反転して昇順 (= b の降順) に保持する。
+    # 先頭の start 個は、もう使われない値 (まとめて切り詰める)
+    window: List[Number] = []
+    start = 0
+    pending: Optional[Number] = None  # B から読んだが、まだ候補範囲に入っていない値
+    b_exhausted = False
+    previous_a = previous_b = None
+
+    for a in a_ascending:
+        if previous_a is not None and a < previous_a:
+            raise ValueError("A must be sorted in ascending order")
+        previous_a = a
+        # この a に対して、いずれかのターゲットの相方になりうる b の範囲
+        b_high = high_target + tolerance - a
+        b_low = low_target - tolerance - a
+
+        # b_high より大きい値は、これ以降の (より大きい) a の相方にもならない
+        start = bisect_left(window, -b_high, start)
+        if start > 1024 and start * 2 > len(window):
+            del window[:start]
+            start = 0
+
+        # b_low 以上の値を B から読み込む
+        while not b_exhausted:
+            if pending is None:
+                try:
+                    pending = next(b_iter)
+                except StopIteration:
+                    b_exhausted = True
+                    break
+                if previous_b is not None and pending > previous_b:
+                    raise ValueError("B must be sorted in descending order")
+                previous_b = pending
+            if pending < b_low:
+                break  # より大きい a の相方になりうるので、次の a まで取っておく
+            if pending <= b_high:
+                window.append(-pending)
+            pending = None
+
+        for target in targets:
+            lo = bisect_left(window, -(target + tolerance - a), start)
+            hi = bisect_right(window, -(target - tolerance - a), lo)
+            for i in range(lo, hi):
+                yield MergeJoinMatch(target, a, -window[i])
+
+
+def find_pairs_in_sorted_files(path_a: str, path_b: str, target: Number, tolerance: Number = 0,
+                               typecode: Optional[str] = None,
+                               parse: Callable[[str], Number] = int) -> Iterator[MergeJoinMatch]:
+    """
+    昇順にソートされた2つのファイルから、a + b == target (誤差 tolerance 以内) のペアを返します。
+    A は先頭から、B は末尾から逆順に読みます。
+
+    target にターゲットの列を渡すと、1回の読み込みで全ターゲットについて探します。
+    """
+    targets = list(target) if isinstance(target, (list, tuple)) else [target]
+    a_values = read_sorted_numbers(path_a, typecode=typecode, parse=parse)
+    b_values = read_sorted_numbers(path_b, reverse=True, typecode=typecode, parse=parse)
+    return merge_join(a_values, b_values, targets, tolerance)
+
+
+# --- 実行例 ---
+if __name__ == "__main__":
+    import tempfile
+
+    a = [1, 3, 3, 5, 8, 10]
+    b = [0, 2, 4, 5, 7, 7, 9]
+    print([(m.a, m.b) for m in merge_join(a, reversed(b), [10])])
+    # 出力: [(1, 9), (3, 7), (3, 7), (3, 7), (3, 7), (5, 5), (8, 2), (10, 0)]
+
+    # 許容誤差つき: |a + b - 10| <= 1
+    print([(m.a, m.b) for m in merge_join([1, 6], reversed(b), [10], tolerance=1)])
+    # 出力: [(1, 9), (6, 5), (6, 4)]
+
+    # 複数のターゲットを1回の読み込みで
+    print(list(merge_join([2, 4], reversed(b), [6, 11])))
+    # 出力: [MergeJoinMatch(target=6, a=2, b=4), MergeJoinMatch(target=11, a=2, b=9),
+    #        MergeJoinMatch(target=6, a=4, b=2), MergeJoinMatch(target=11, a=4, b=7),
+    #        MergeJoinMatch(target=11, a=4, b=7)]
+
+    # ファイルから (B は末尾から逆順に、小さなチャンクで読む)
+    with tempfile.TemporaryDirectory() as tmp:
+        path_a, path_b, path_bin = (os.path.join(tmp, name) for name in ("a.txt", "b.txt", "b.bin"))
+        with open(path_a, "w") as f:
+            f.write("\n".join(map(str, a)) + "\n")
+        with open(path_b, "w") as f:
+            f.write("\n".join(map(str, b)) + "\n")
+        print(list(read_sorted_numbers(path_b, reverse=True, chunk_size=4)))
+        # 出力: [9, 7, 7, 5, 4, 2, 0]
+        print([(m.a, m.b) for m in find_pairs_in_sorted_files(path_a, path_b, 13)])
+        # 出力: [(8, 5)]
+
+        with open(path_bin, "wb") as f:
+            array("q", b).tofile(f)
+        print(list(read_sorted_numbers(path_bin, reverse=True, typecode="q", chunk_size=16)))
+        # 出力: [9, 7, 7, 5, 4, 2, 0]
@@ -0,0 +1,294 @@
+# coding: utf-8
+"""
+サンプルのアルゴリズムをファイルや標準入力に対して実行するコマンドラインツール
+
+使い方:
+    python practice_cli.py window-sum -k 3 data.txt
+    python practice_cli.py pair-sum --target 9 sorted.txt
+    python practice_cli.py top-k -k 10 --binary --dtype i a.bin b.bin --jobs 4
+    python practice_cli.py top-k-frequent -k 5 < keys.txt
+    python practice_cli.py cyclic-sort perm.txt
+    python practice_cli.py cyclic-sort --binary --dtype i --in-place perm.bin
+    python practice_cli.py tree --order zigzag trees.txt
+
+入力:
+- テキスト (既定): 空白または改行区切りの整数。1行ずつ読むため、入力全体をメモリに載せません。
+- バイナリ (--binary): --dtype で指定した固定幅の整数 (ネイティブのバイトオーダー) の並び。
+  チャンク単位で読みます。
+- tree コマンドは1行に1本の木を、レベルオーダーの直列化形式
+  ("3,9,20,null,null,15,7"。tree_bfs_example.parse_level_order を参照) で読みます。
+ファイルを省略するか "-" を指定すると標準入力を読みます。
+
+メモリ:
+- window-sum: O(k) / top-k: O(k) / top-k-frequent: O(異なる値の数) / tree: O(1 本の木)
+- pair-sum と cyclic-sort は入力全体へのランダムアクセスが必要なため、値を array に
+  読み込みます (要素あたり dtype のバイト数。Python のリストの約 1/4〜1/8)。
+  バイナリファイルの cyclic-sort は --in-place を付けると外部メモリ版
+  (cyclic_sort_external_example.cyclic_sort_file) でファイルを直接並べ替えます。
+
+複数のファイルを --jobs N で指定すると、ファイルごとにワーカープロセスで並列に処理し、
+結果を入力の順に "==> ファイル名 <==" の見出し付きで出力します。ワーカーは出力を一時ファイルに
+書き、親プロセスがそれを入力の順にコピーするので、出力全体をメモリに載せることはありません。
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from cyclic_sort_example import cyclic_sort_buffer
+from cyclic_sort_external_example import cyclic_sort_file
+from sliding_window_example import max_sub_array_of_size_k_stream
+from top_k_elements_example import find_k_frequent_numbers, find_k_largest_numbers_stream
+from tree_bfs_example import (deserialize_level_order, level_order_traversal, min_depth,
+                              parse_level_order, zigzag_level_order)
+from tree_dfs_example import dfs_in_order_iterative, dfs_post_order_iterative, dfs_pre_order_iterative
+from two_pointers_example import try_find_pair_with_target_sum
+
+CHUNK_BYTES = 1 << 16
+
+TREE_ORDERS: Dict[str, Callable] = {
+    "level": level_order_traversal,
+    "zigzag": zigzag_level_order,
+    "min-depth": min_depth,
+    "pre": dfs_pre_order_iterative,
+    "in": dfs_in_order_iterative,
+    "post": dfs_post_order_iterative,
+}
+
+
+class CliError(Exception):
+    """ユーザーに表示して終了するエラー"""
+
+
+# --- 入力の読み込み ---
+
+def iter_text_ints(stream: TextIO) -> Iterator[int]:
+    """空白または改行区切りの整数を1つずつ返します。"""
+    for line_number, line in enumerate(stream, 1):
+        for token in line.split():
+            try:
+                yield int(token)
+            except ValueError:
+                raise CliError(f"line {line_number}: not an integer: {token!r}") from None
+
+
+def iter_binary_ints(stream: BinaryIO, typecode: str) -> Iterator[int]:
+    """固定幅の整数をチャンク単位で読み、1つずつ返します。"""
+    itemsize = array(typecode).itemsize
+    chunk_bytes = CHUNK_BYTES - CHUNK_BYTES % itemsize
+    rest = b""
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            break
+        data = rest + data
+        usable = len(data) - len(data) % itemsize
+        chunk = array(typecode)
+        chunk.frombytes(data[:usable])
+        rest = data[usable:]
+        yield from chunk
+    if rest:
+        raise CliError(f"trailing {len(rest)} bytes do not form a whole {itemsize}-byte integer")
+
+
+def _open_values(path: str, options: argparse.Namespace, stack: List) -> Iterable[int]:
+    if options.binary:
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        if path != "-":
+            stack.append(stream)
+        return iter_binary_ints(stream, options.dtype)
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    if path != "-":
+        stack.append(stream)
+    return iter_text_ints(stream)
+
+
+# --- コマンド ---
+# 各コマンドは (値のイテラブル, オプション) を受け取り、出力する行を順に返す
+
+def _cmd_window_sum(values: Iterable[int], options: argparse.Namespace) -> Iterator[str]:
+    yield str(max_sub_array_of_size_k_stream(options.k, values))
+
+
+def _to_array(values: Iterable[int], typecode: str) -> array:
+    try:
+        return array(typecode, values)
+    except OverflowError as e:  # --dtype の範囲に収まらない値
+        raise CliError(f"value out of range for --dtype {typecode}: {e}") from None
+
+
+def _cmd_pair_sum(values: Iterable[int], options: argparse.Namespace) -> Iterator[str]:
+    numbers = _to_array(values, options.dtype)
+    yield json.dumps(try_find_pair_with_target_sum(numbers, options.target))  # 解がなければ []
+
+
+def _cmd_top_k(values: Iterable[int], options: argparse.Namespace) -> Iterator[str]:
+    for value in sorted(find_k_largest_numbers_stream(values, options.k), reverse=True):
+        yield str(value)
+
+
+def _cmd_top_k_frequent(values: Iterable[int], options: argparse.Namespace) -> Iterator[str]:
+    for value in find_k_frequent_numbers(values, options.k):
+        yield str(value)
+
+
+def _cmd_cyclic_sort(values: Iterable[int], options: argparse.Namespace) -> Iterator[str]:
+    numbers = _to_array(values, options.dtype)
+    n = len(numbers)
+    # cyclic_sort_buffer は重複をその場に残して終わるが、CLI は 1..n の順列だけを受け付ける
+    seen = bytearray(n + 1)
+    for v in numbers:
+        if not 1 <= v <= n or seen[v]:
+            raise CliError(f"input is not a permutation of 1..{n}")
+        seen[v] = 1
+    cyclic_sort_buffer(numbers)
+    for value in numbers:
+        yield str(value)
+
+
+COMMANDS: Dict[str, Callable[[Iterable[int], argparse.Namespace], Iterator[str]]] = {
+    "window-sum": _cmd_window_sum,
+    "pair-sum": _cmd_pair_sum,
+    "top-k": _cmd_top_k,
+    "top-k-frequent": _cmd_top_k_frequent,
+    "cyclic-sort": _cmd_cyclic_sort,
+}
+
+
+def _run_tree(stream: TextIO, options: argparse.Namespace) -> Iterator[str]:
+    traverse = TREE_ORDERS[options.order]
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            values = parse_level_order(line)
+        except ValueError as e:
+            raise CliError(f"line {line_number}: {e}") from None
+        yield json.dumps(traverse(deserialize_level_order(values)))
+
+
+def iter_output(path: str, options: argparse.Namespace) -> Iterator[str]:
+    """1つの入力 (ファイルまたは "-") を処理し、出力する行を順に返します。"""
+    opened: List = []
+    try:
+        if options.command == "tree":
+            if options.binary:
+                raise CliError("tree does not support --binary input")
+            stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+            if path != "-":
+                opened.append(stream)
+            yield from _run_tree(stream, options)
+        elif options.command == "cyclic-sort" and options.in_place:
+            if not options.binary or path == "-":
+                raise CliError("--in-place requires --binary and a file path")
+            cyclic_sort_file(path, options.dtype)
+        else:
+            yield from COMMANDS[options.command](_open_values(path, options, opened), options)
+    except OSError as e:
+        raise CliError(str(e)) from None
+    finally:
+        for stream in opened:
+            stream.close()
+
+
+def process_file(path: str, options: argparse.Namespace) -> str:
+    """
+    ワーカープロセスで1ファイルを処理し、出力を書いた一時ファイルのパスを返します。
+    一時ファイルの削除は呼び出し側の責任です (失敗した場合はここで削除します)。
+    """
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".out", delete=False) as out:
+        try:
+            for line in iter_output(path, options):
+                out.write(line + "\n")
+        except BaseException as e:
+            out.close()
+            os.remove(out.name)
+            if isinstance(e, CliError):
+                raise CliError(f"{path}: {e}") from None
+            raise
+    return out.name
+
+
+def _discard_outputs(futures: List) -> None:
+    """まだコピーしていないワーカーの一時ファイルを削除します。"""
+    for future in futures:
+        future.cancel()
+    for future in futures:
+        if not future.cancelled() and future.exception() is None:
+            os.remove(future.result())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="practice_cli",
+                                     description=__doc__.split("\n\n")[0].strip())
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("files", nargs="*", default=["-"], help="入力ファイル (省略時または - は標準入力)")
+    common.add_argument("--binary", action="store_true", help="固定幅の整数のバイナリとして読む")
+    common.add_argument("--dtype", default="q", choices=["b", "h", "i", "l", "q"],
+                        help="整数の型 (array の型コード。既定: q = int64)")
+    common.add_argument("--jobs", type=int, default=1, help="複数ファイルを並列に処理するプロセス数")
+
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("window-sum", parents=[common], help="サイズ k の部分配列の最大和")
+    p.add_argument("-k", type=int, required=True)
+    p = sub.add_parser("pair-sum", parents=[common], help="ソート済みの列で和が target になるペア")
+    p.add_argument("--target", type=int, required=True)
+    p = sub.add_parser("top-k", parents=[common], help="上位 K 個の値 (降順)")
+    p.add_argument("-k", type=int, required=True)
+    p = sub.add_parser("top-k-frequent", parents=[common], help="頻出上位 K 個の値")
+    p.add_argument("-k", type=int, required=True)
+    p = sub.add_parser("cyclic-sort", parents=[common], help="1..n の順列を循環ソート")
+    p.add_argument("--in-place", action="store_true",
+                   help="バイナリファイルを外部メモリ版で直接並べ替える (出力なし)")
+    p = sub.add_parser("tree", parents=[common], help="直列化された木 (1行1本) を走査")
+    p.add_argument("--order", default="level", choices=sorted(TREE_ORDERS))
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = build_parser().parse_args(argv)
+    files = options.files
+    if files.count("-") > 1:
+        print("practice_cli: standard input can only be read once", file=sys.stderr)
+        return 2
+    show_headers = len(files) > 1
+    out = sys.stdout
+
+    try:
+        if options.jobs > 1 and len(files) > 1 and "-" not in files:
+            with ProcessPoolExecutor(max_workers=options.jobs) as pool:
+                futures = [pool.submit(process_file, path, options) for path in files]
+                try:
+                    # 結果を入力の順に待つので、出力の順序はファイルの指定順のまま
+                    for i, path in enumerate(files):
+                        output_path = futures[i].result()
+                        futures[i] = None  # この一時ファイルはすぐ下で削除するので _discard_outputs の対象から外す
+                        try:
+                            if show_headers:
+                                out.write(("\n" if i else "") + f"==> {path} <==\n")
+                            with open(output_path, encoding="utf-8") as f:
+                                shutil.copyfileobj(f, out)
+                        finally:
+                            os.remove(output_path)
+                finally:
+                    _discard_outputs([future for future in futures if future is not None])
+        else:
+            for i, path in enumerate(files):
+                if show_headers:
+                    out.write(("\n" if i else "") + f"==> {path} <==\n")
+                for line in iter_output(path, options):
+                    out.write(line + "\n")
+    except CliError as e:
+        print(f"practice_cli: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,12 @@ Sliding Window パターンが適用できる可能性のある問題の特徴:
 - 文字列アナグラム (String anagrams) (Hard)
 """
 
+from collections import deque
+from itertools import accumulate
+from operator import sub
+
+from buffer_views import INT64_MAX, abs_bound, as_ndarray, chunk_size, is_integer, np, numeric_view
+
 def max_sub_array_of_size_k(k, arr):
     """
     与えられた配列の中で、サイズ 'k' の連続する部分配列の最大和を求める関数 (Sliding Window パターン使用)
@@ -43,7 +49,13 @@ def max_sub_array_of_size_k(k, arr):
     2. ウィンドウを1つずつ右にスライドさせる。
     3. スライドごとに、ウィンドウの左端の要素を和から引き、右端の新しい要素を和に加える。
     4. 各ステップで現在の和と最大和を比較し、最大和を更新する。
+
+    arr には array.array や NumPy 配列などのバッファも渡せます。その場合はリストに変換せず、
+    バッファを直接読みます (_max_sub_array_of_size_k_buffer)。
     """
+    view = numeric_view(arr)
+    if view is not None:
+        return _max_sub_array_of_size_k_buffer(k, view)
     if not arr or k <= 0 or k > len(arr):
         return 0  # 不正な入力や、k が配列長より大きい場合
 
@@ -62,6 +74,172 @@ def max_sub_array_of_size_k(k, arr):
 
     return max_sum
 
+def _max_sub_array_of_size_k_buffer(k, view):
+    # max_sub_array_of_size_k の数値バッファ版。view は buffer_views.numeric_view の戻り値
+    n = len(view)
+    if k <= 0 or k > n:
+        return 0
+
+    values = as_ndarray(view)
+    # 整数で、ウィンドウ和と隣り合うウィンドウの差が int64 に収まるときだけ NumPy を使う
+    if values is not None and is_integer(view) and abs_bound(values) * max(k, 2) <= INT64_MAX:
+        window_sum = int(values[:k].sum(dtype=np.int64))
+        max_sum = max(0, window_sum)
+        step = chunk_size(n)
+        for start in range(0, n - k, step):
+            stop = min(start + step, n - k)
+            # ウィンドウを1つ右にずらすと、和は (新しい右端の要素 - 古い左端の要素) だけ変わる
+            sums = np.cumsum(values[start + k:stop + k].astype(np.int64)
+                             - values[start:stop].astype(np.int64))
+            sums += window_sum
+            max_sum = max(max_sum, int(sums.max()))
+            window_sum = int(sums[-1])
+        return max_sum
+
+    # memoryview を直接走査する。左端と右端の要素を zip で組にして、インデックス計算を省く
+    window_sum = 0
+    for value in view[:k]:
+        window_sum += value
+    max_sum = max(0, window_sum)
+    for added, removed in zip(view[k:], view):
+        window_sum = window_sum - removed + added
+        if window_sum > max_sum:
+            max_sum = window_sum
+    return max_sum
+
+def max_sub_array_of_size_k_stream(k, iterable):
+    """
+    max_sub_array_of_size_k のストリーム版。配列の代わりに任意のイテラブル
+    (ファイルから1行ずつ読んだ値など) を受け取り、要素を1回だけ読みます。
+
+    引数:
+    k (int): 部分配列のサイズ
+    iterable (Iterable[int]): 整数の列
+
+    戻り値:
+    int: max_sub_array_of_size_k と同じ値 (要素数が k 未満なら 0)
+
+    時間計算量: O(n)
+    空間計算量: O(k)  # ウィンドウ内の k 個の要素だけを保持する (左端の要素を引くため)
+    """
+    if k <= 0:
+        return 0
+
+    max_sum = 0
+    window_sum = 0
+    window = deque()  # 現在のウィンドウの要素
+
+    for value in iterable:
+        window.append(value)  # ウィンドウの右端の要素を加える
+        window_sum += value
+        if len(window) > k:
+            window_sum -= window.popleft()  # ウィンドウの左端の要素を引く
+        if len(window) == k:
+            max_sum = max(max_sum, window_sum)  # 最大和を更新
+
+    return max_sum
+
+class SlidingWindowQuery:
+    """
+    同じ配列に対して、いろいろなウィンドウサイズや区間の問い合わせを繰り返すためのクエリオブジェクト
+
+    max_sub_array_of_size_k を k ごとに呼ぶと、そのたびに配列全体を走査し直します。
+    このクラスは構築時に累積和 (prefix sum) を1回だけ計算し、以後の問い合わせで共有します。
+    - range_sum(i, j): arr[i:j] の和を O(1) で返す
+    - range_max(i, j): arr[i:j] の最大値を O(1) で返す (スパーステーブルを使う)
+    - best_window(k): サイズ k の部分配列の最大和 (max_sub_array_of_size_k と同じ値)
+    - best_windows(ks): 複数の k についての best_window
+
+    引数:
+    arr (Iterable[int]): 整数の列 (リスト、array.array、NumPy 配列など)。
+        シーケンスやバッファはコピーせずに参照するため、構築後に書き換えないでください
+        (C 連続でない NumPy 配列だけは tolist() でリストにする)
+    sparse_table (bool): True なら構築時にスパーステーブルも作る。
+        False なら最初に range_max を呼んだときに作る
+
+    計算量:
+    構築: O(n) (スパーステーブルを作る場合は O(n log n))
+    range_sum / range_max: O(1)
+    best_window: O(n - k)  # 累積和の差の最大値を1回求めるだけ (要素の加算をし直さない)
+    空間計算量: O(n) (スパーステーブルを作る場合は O(n log n))
+    """
+
+    def __init__(self, arr, sparse_table=False):
+        # スパーステーブルを後から作るために元の列を参照しておく (シーケンスならコピーしない)。
+        # バッファは memoryview を通して読むので、要素は Python の int / float になり、
+        # NumPy の int32 などの固定幅の整数のまま累積してあふれることはない
+        view = numeric_view(arr)
+        if view is not None:
+            self._values = view
+        elif hasattr(arr, "tolist"):  # C 連続でない NumPy 配列など
+            self._values = arr.tolist()
+        elif hasattr(arr, "__getitem__") and hasattr(arr, "__len__"):
+            self._values = arr
+        else:
+            self._values = list(arr)
+        # prefix[i] は arr[:i] の和
+        self._prefix = list(accumulate(self._values, initial=0))
+        self._sparse = None
+        if sparse_table:
+            self._build_sparse_table()
+
+    def __len__(self):
+        return len(self._prefix) - 1
+
+    def _build_sparse_table(self):
+        # table[j][i] は arr[i : i + 2^j] の最大値
+        level = list(self._values)
+        table = [level]
+        width = 1
+        while 2 * width <= len(level):
+            prev = table[-1]
+            table.append(list(map(max, prev, prev[width:])))
+            width *= 2
+        self._sparse = table
+
+    def _check_range(self, i, j):
+        if not 0 <= i <= j <= len(self):
+            raise ValueError(f"invalid range [{i}, {j}) for length {len(self)}")
+
+    def range_sum(self, i, j):
+        """
+        arr[i:j] の和を返します (0 <= i <= j <= n。i == j なら 0)。
+        """
+        self._check_range(i, j)
+        return self._prefix[j] - self._prefix[i]
+
+    def range_max(self, i, j):
+        """
+        arr[i:j] の最大値を返します (0 <= i < j <= n)。
+        長さ 2^level の2つの区間 [i, i + 2^level) と [j - 2^level, j) で [i, j) を覆い、
+        それぞれの最大値の大きい方を返します。
+        """
+        self._check_range(i, j)
+        if i == j:
+            raise ValueError("range_max of an empty range")
+        if self._sparse is None:
+            self._build_sparse_table()
+        level = (j - i).bit_length() - 1
+        row = self._sparse[level]
+        return max(row[i], row[j - (1 << level)])
+
+    def best_window(self, k):
+        """
+        サイズ k の連続する部分配列の最大和を返します。
+        max_sub_array_of_size_k と同じく、該当する部分配列がない場合や最大和が負の場合は 0 を返します。
+        """
+        prefix = self._prefix
+        if k <= 0 or k > len(self):
+            return 0
+        # prefix[i + k] - prefix[i] がウィンドウ [i, i + k) の和
+        return max(0, max(map(sub, prefix[k:], prefix)))
+
+    def best_windows(self, ks):
+        """
+        複数のウィンドウサイズについての best_window を、ks と同じ順のリストで返します。
+        """
+        return [self.best_window(k) for k in ks]
+
 # Example Usage:
 if __name__ == "__main__":
     arr1 = [2, 1, 5, 1, 3, 2]
@@ -83,3 +261,12 @@ if __name__ == "__main__":
     k4 = 5
     print(f"\nInput: k={k4}, arr={arr4}")
     print(f"Output: {max_sub_array_of_size_k(k4, arr4)}") # Expected output: 0 (k > len(arr))
+
+    print(f"\nStream: k={k1}, iter(arr)={arr1}")
+    print(f"Output: {max_sub_array_of_size_k_stream(k1, iter(arr1))}") # Expected output: 9
+
+    query = SlidingWindowQuery(arr1)
+    print(f"\nQuery: arr={arr1}")
+    print(f"best_windows([1, 2, 3, 7]) = {query.best_windows([1, 2, 3, 7])}") # Expected output: [5, 6, 9, 0]
+    print(f"range_sum(2, 5) = {query.range_sum(2, 5)}") # Expected output: 9
+    print(f"range_max(3, 6) = {query.range_max(3, 6)}") # Expected output: 3
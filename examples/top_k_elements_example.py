@@ -1,4 +1,9 @@
 import heapq
+import os
+
+import instrumentation
+from buffer_views import as_ndarray, chunk_size, np, numeric_view
+from merge_join_example import read_sorted_numbers
 
 # Top K Elements パターン
 #
@@ -53,11 +58,33 @@ def find_k_largest_numbers(nums, k):
   空間計算量:
     O(K)
     - ヒープに最大 K 個の要素を格納するため。
+
+  nums には array.array や NumPy 配列などのバッファも渡せます。その場合はリストに変換せず、
+  バッファを直接読みます (NumPy があれば _find_k_largest_numbers_ndarray)。
   """
+  started = instrumentation.start()
+  counts = {"scanned": len(nums)} if started is not None else None
   if k <= 0:
-    return []
-  if k >= len(nums):
-    return nums
+    result = []
+  elif k >= len(nums):
+    result = nums
+  else:
+    view = numeric_view(nums)
+    values = as_ndarray(view) if view is not None else None
+    if values is not None:
+      result = _find_k_largest_numbers_ndarray(values, k, counts)
+    else:
+      result = _find_k_largest_numbers_heap(nums if view is None else view, k, counts)
+  if started is not None:
+    instrumentation.emit("find_k_largest_numbers", started, counts, len(result))
+  return result
+
+def _find_k_largest_numbers_heap(nums, k, counts=None):
+  # find_k_largest_numbers のヒープ版 (0 < k < len(nums))。nums はリストか memoryview
+  # 計測中 (counts が None でない) は、heappush / heappushpop を呼び出し回数を数えるものに差し替える
+  push, pushpop = heapq.heappush, heapq.heappushpop
+  if counts is not None:
+    push, pushpop = instrumentation.CountingCall(push), instrumentation.CountingCall(pushpop)
 
   # 最小ヒープ (min-heap) を使用します。
   # ヒープには常に K 個の要素が格納され、ヒープのルート (最小値) が
@@ -66,7 +93,7 @@ def find_k_largest_numbers(nums, k):
 
   # 最初の K 個の要素をヒープに追加
   for i in range(k):
-    heapq.heappush(min_heap, nums[i])
+    push(min_heap, nums[i])
 
   # 残りの要素を処理
   for i in range(k, len(nums)):
@@ -74,32 +101,182 @@ def find_k_largest_numbers(nums, k):
     if nums[i] > min_heap[0]:
       # ヒープの最小値を削除し、現在の要素を追加
       # heappushpop は push と pop を効率的に行う
-      heapq.heappushpop(min_heap, nums[i])
+      pushpop(min_heap, nums[i])
 
+  if counts is not None:
+    counts.update(pushes=push.calls, pushpops=pushpop.calls)
   # ヒープに残っている K 個の要素が上位 K 個の数値
   return list(min_heap)
 
-# --- 実行例 ---
-nums1 = [3, 1, 5, 12, 2, 11]
-k1 = 3
-print(f"リスト: {nums1}, K={k1}")
-print(f"上位 K 個の数値: {find_k_largest_numbers(nums1, k1)}") # 出力例: [5, 11, 12] (順不同)
+def _find_k_largest_numbers_ndarray(values, k, counts=None):
+  """
+  find_k_largest_numbers の NumPy 版 (0 < k < len(values))。
+  chunk_size(N) 個ずつ、現在の上位 K 個の最小値 (threshold) より大きい要素を候補として溜め、
+  候補が K 個以上になったら、上位 K 個と合わせて np.partition で上位 K 個を選び直します。
+
+  時間計算量: O(N)  # 1回の partition は O(K + 候補数) で、候補数は K 以上なので、
+                    # partition の合計は候補の総数 (N 以下) の定数倍
+  空間計算量: O(K + chunk_size(N))  # values のコピーは作らない
+
+  counts が None でなければ、候補の数 (candidates) と partition の回数 (partitions) を加えます。
+  """
+  top = np.array(values[:k])
+  candidate_total = 0
+  partitions = 0
+  threshold = top.min().item()  # Python のスカラーとして保持する
+  pending = []  # まだ top と合わせていない候補
+  pending_count = 0
+  step = chunk_size(len(values))
+  for start in range(k, len(values), step):
+    chunk = values[start:start + step]
+    candidates = chunk[chunk > threshold]
+    if len(candidates):
+      pending.append(candidates)
+      pending_count += len(candidates)
+      if pending_count >= k:
+        top = _merge_top_k(top, pending, k)
+        threshold = top.min().item()
+        candidate_total += pending_count
+        partitions += 1
+        pending = []
+        pending_count = 0
+  if pending:
+    top = _merge_top_k(top, pending, k)
+    candidate_total += pending_count
+    partitions += 1
+  if counts is not None:
+    counts.update(candidates=candidate_total, partitions=partitions)
+  return top.tolist()
+
+def _merge_top_k(top, pending, k):
+  merged = np.concatenate([top] + pending)
+  return np.partition(merged, len(merged) - k)[-k:]
+
+def find_k_largest_numbers_stream(iterable, k):
+  """
+  find_k_largest_numbers のストリーム版。リストの代わりに任意のイテラブルを受け取り、
+  要素を1回だけ読みながらサイズ K の最小ヒープを更新します。
 
-nums2 = [5, 12, 11, -1, 12]
-k2 = 3
-print(f"\nリスト: {nums2}, K={k2}")
-print(f"上位 K 個の数値: {find_k_largest_numbers(nums2, k2)}") # 出力例: [11, 12, 12] (順不同)
+  Args:
+    iterable: 数値のイテラブル (ファイルから1行ずつ読んだ値など)
+    k: 見つけたい上位要素の数
 
-nums3 = [1, 2, 3, 4, 5]
-k3 = 5
-print(f"\nリスト: {nums3}, K={k3}")
-print(f"上位 K 個の数値: {find_k_largest_numbers(nums3, k3)}") # 出力例: [1, 2, 3, 4, 5]
+  Returns:
+    上位 K 個の数値を含むリスト (順不同)。要素数が K 以下なら全要素。
 
-nums4 = [1, 2, 3]
-k4 = 0
-print(f"\nリスト: {nums4}, K={k4}")
-print(f"上位 K 個の数値: {find_k_largest_numbers(nums4, k4)}") # 出力例: []
+  時間計算量: O(N log K)
+  空間計算量: O(K)  # 入力全体をメモリに載せない
+  """
+  if k <= 0:
+    return []
+  min_heap = []
+  for num in iterable:
+    if len(min_heap) < k:
+      heapq.heappush(min_heap, num)
+    elif num > min_heap[0]:
+      heapq.heappushpop(min_heap, num)
+  return min_heap
 
+# 例題: ソート済みのシャードからの Top 'K' (k-way マージ)
+#
+# 入力が上流のシャードごとにソート済みの列として届く場合、全要素を走査する必要はありません。
+# 各シャードの最大の要素だけを最大ヒープに入れ、ヒープから最大値を取り出すたびに
+# そのシャードの次の要素を1つだけ読みます。上位 K 個を得るまでに読む要素は
+# 高々 K + シャード数 個です。
+
+class SortedShardsTopK:
+  """
+  ソート済みの複数のシャードを大きい方から遅延 k-way マージし、上位の要素をページ単位で返します。
+  next_page を呼ぶたびに、前回の続き (次に大きい要素) から返すため、最初からやり直しません。
+
+  Args:
+    shards: シャードの列。各シャードは次のいずれか
+      - 昇順のシーケンス (リスト、array.array など。末尾から逆順に読む)
+      - 昇順のソート済みファイルのパス (merge_join_example.read_sorted_numbers で末尾から読む)
+      - ascending=False なら、降順のイテラブル (ジェネレータなど)
+    ascending: シャードが昇順かどうか
+    typecode: ファイルのシャードをバイナリとして読む場合の array の型コード (省略時はテキスト)
+
+  計算量:
+    構築: O(S log S)  # S はシャード数。各シャードの先頭を1つずつ読む
+    next_page(k): O(k log S)
+  空間計算量: O(S)  # シャードごとに読みかけの要素1つとイテレータだけを保持する
+  """
+
+  def __init__(self, shards, ascending=True, typecode=None):
+    # 最大ヒープ (値の符号を反転して heapq に入れる)。要素は (-値, シャード番号, イテレータ)。
+    # シャード番号で同じ値の比較を打ち切り、イテレータ同士を比較しないようにする
+    self._heap = []
+    self.elements_read = 0  # これまでにシャードから読んだ要素数
+    for index, shard in enumerate(shards):
+      iterator = self._descending(shard, ascending, typecode)
+      for value in iterator:
+        self.elements_read += 1
+        self._heap.append((-value, index, iterator))
+        break
+    heapq.heapify(self._heap)
+
+  @staticmethod
+  def _descending(shard, ascending, typecode):
+    if isinstance(shard, (str, os.PathLike)):
+      return read_sorted_numbers(shard, reverse=ascending, typecode=typecode)
+    if not ascending:
+      return iter(shard)
+    try:
+      return reversed(shard)
+    except TypeError:
+      raise TypeError("ascending shards must be sequences or file paths; "
+                      "pass descending iterables with ascending=False") from None
+
+  def next_page(self, k):
+    """
+    次に大きい要素を最大 k 個、降順のリストで返します。すべて返し終えたら空のリストを返します。
+
+    Raises:
+      ValueError: シャードの並び順が ascending の指定と合わない場合
+    """
+    page = []
+    heap = self._heap
+    while heap and len(page) < k:
+      neg_value, index, iterator = heap[0]
+      page.append(-neg_value)
+      for value in iterator:
+        self.elements_read += 1
+        if -value < neg_value:
+          raise ValueError(f"shard {index} is not sorted")
+        heapq.heapreplace(heap, (-value, index, iterator))
+        break
+      else:
+        heapq.heappop(heap)  # このシャードは読み終えた
+    return page
+
+  def __iter__(self):
+    # 残りの要素をすべて降順に返す
+    while True:
+      page = self.next_page(1024)
+      if not page:
+        return
+      yield from page
+
+def find_k_largest_from_sorted_shards(shards, k, ascending=True, typecode=None):
+  """
+  ソート済みの複数のシャードから上位 K 個の数値を見つけます。
+
+  Args:
+    shards: シャードの列 (SortedShardsTopK を参照)
+    k: 見つけたい上位要素の数
+    ascending: シャードが昇順かどうか
+    typecode: ファイルのシャードをバイナリとして読む場合の array の型コード
+
+  Returns:
+    上位 K 個の数値を含むリスト (降順)。全要素が K 個以下なら全要素。
+
+  時間計算量: O(S log S + K log S)  # S はシャード数
+  空間計算量: O(S + K)
+  """
+  if k <= 0:
+    return []
+  return SortedShardsTopK(shards, ascending, typecode).next_page(k)
 
 # 例題: Top 'K' Frequent Numbers (頻出上位 K 個の数値)
 from collections import Counter
@@ -163,22 +340,53 @@ def find_k_frequent_numbers(nums, k):
   return top_k
 
 # --- 実行例 ---
-nums_freq1 = [1, 3, 5, 12, 11, 12, 11]
-k_freq1 = 2
-print(f"\nリスト: {nums_freq1}, K={k_freq1}")
-print(f"頻出上位 K 個の数値: {find_k_frequent_numbers(nums_freq1, k_freq1)}") # 出力例: [11, 12] (順不同)
-
-nums_freq2 = [1, 1, 1, 2, 2, 3]
-k_freq2 = 2
-print(f"\nリスト: {nums_freq2}, K={k_freq2}")
-print(f"頻出上位 K 個の数値: {find_k_frequent_numbers(nums_freq2, k_freq2)}") # 出力例: [1, 2] (順不同)
-
-nums_freq3 = [1]
-k_freq3 = 1
-print(f"\nリスト: {nums_freq3}, K={k_freq3}")
-print(f"頻出上位 K 個の数値: {find_k_frequent_numbers(nums_freq3, k_freq3)}") # 出力例: [1]
-
-nums_freq4 = [1, 2, 3]
-k_freq4 = 4
-print(f"\nリスト: {nums_freq4}, K={k_freq4}")
-print(f"頻出上位 K 個の数値: {find_k_frequent_numbers(nums_freq4, k_freq4)}") # 出力例: [1, 2, 3]
+if __name__ == "__main__":
+  nums1 = [3, 1, 5, 12, 2, 11]
+  k1 = 3
+  print(f"リスト: {nums1}, K={k1}")
+  print(f"上位 K 個の数値: {find_k_largest_numbers(nums1, k1)}") # 出力例: [5, 11, 12] (順不同)
+
+  nums2 = [5, 12, 11, -1, 12]
+  k2 = 3
+  print(f"\nリスト: {nums2}, K={k2}")
+  print(f"上位 K 個の数値: {find_k_largest_numbers(nums2, k2)}") # 出力例: [11, 12, 12] (順不同)
+
+  nums3 = [1, 2, 3, 4, 5]
+  k3 = 5
+  print(f"\nリスト: {nums3}, K={k3}")
+  print(f"上位 K 個の数値: {find_k_largest_numbers(nums3, k3)}") # 出力例: [1, 2, 3, 4, 5]
+
+  nums4 = [1, 2, 3]
+  k4 = 0
+  print(f"\nリスト: {nums4}, K={k4}")
+  print(f"上位 K 個の数値: {find_k_largest_numbers(nums4, k4)}") # 出力例: []
+
+  print(f"\nストリーム: {nums1}, K={k1}")
+  print(f"上位 K 個の数値: {find_k_largest_numbers_stream(iter(nums1), k1)}") # 出力例: [5, 12, 11] (順不同)
+
+  shards = [[1, 4, 9, 12], [2, 3, 15], [7, 8, 10, 11]]
+  print(f"\nソート済みシャード: {shards}, K={k1}")
+  print(f"上位 K 個の数値: {find_k_largest_from_sorted_shards(shards, k1)}") # 出力例: [15, 12, 11]
+  merger = SortedShardsTopK(shards)
+  print(f"1ページ目: {merger.next_page(4)}, 2ページ目: {merger.next_page(4)}") # 出力例: [15, 12, 11, 10], [9, 8, 7, 4]
+  print(f"読んだ要素数: {merger.elements_read}") # 出力例: 10
+
+  nums_freq1 = [1, 3, 5, 12, 11, 12, 11]
+  k_freq1 = 2
+  print(f"\nリスト: {nums_freq1}, K={k_freq1}")
+  print(f"頻出上位 K 個の数値: {find_k_frequent_numbers(nums_freq1, k_freq1)}") # 出力例: [11, 12] (順不同)
+
+  nums_freq2 = [1, 1, 1, 2, 2, 3]
+  k_freq2 = 2
+  print(f"\nリスト: {nums_freq2}, K={k_freq2}")
+  print(f"頻出上位 K 個の数値: {find_k_frequent_numbers(nums_freq2, k_freq2)}") # 出力例: [1, 2] (順不同)
+
+  nums_freq3 = [1]
+  k_freq3 = 1
+  print(f"\nリスト: {nums_freq3}, K={k_freq3}")
+  print(f"頻出上位 K 個の数値: {find_k_frequent_numbers(nums_freq3, k_freq3)}") # 出力例: [1]
+
+  nums_freq4 = [1, 2, 3]
+  k_freq4 = 4
+  print(f"\nリスト: {nums_freq4}, K={k_freq4}")
+  print(f"頻出上位 K 個の数値: {find_k_frequent_numbers(nums_freq4, k_freq4)}") # 出力例: [1, 2, 3]
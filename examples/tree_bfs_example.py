@@ -1,6 +1,8 @@
 # coding: utf-8
 from collections import deque
-from typing import List, Optional
+from typing import Iterable, List, Optional
+
+import instrumentation
 
 # Definition for a binary tree node.
 class TreeNode:
@@ -63,11 +65,11 @@ def level_order_traversal(root: Optional[TreeNode]) -> List[List[int]]:
         最悪の場合 (完全二分木など)、最後のレベルには約 N/2 個のノードが含まれる可能性があるため、
         空間計算量は O(N) とも言えます。結果を格納するリストも最悪 O(N) の空間を必要とします。
     """
+    started = instrumentation.start()
     result: List[List[int]] = []
-    if not root:
-        return result
-
-    queue = deque([root]) # 探索対象のノードを格納するキュー
+    queue = deque([root] if root else []) # 探索対象のノードを格納するキュー
+    if started is not None:
+        queue = instrumentation.PeakDeque(queue)  # 同じループのままキューの最大の長さを記録する
     while queue:
         level_size = len(queue) # 現在のレベルのノード数
         current_level: list[int] = [] # 現在のレベルのノード値を格納するリスト
@@ -81,6 +83,9 @@ def level_order_traversal(root: Optional[TreeNode]) -> List[List[int]]:
             if node.right:
                 queue.append(node.right)
         result.append(current_level) # 現在のレベルのリストを結果リストに追加
+    if started is not None:
+        instrumentation.emit("level_order_traversal", started,
+                             {"visited": sum(map(len, result)), "levels": len(result)}, queue.peak)
     return result
 
 # --- 例題 1: Zigzag Traversal ---
@@ -190,6 +195,74 @@ def min_depth(root: Optional[TreeNode]) -> int:
     return 0
 
 
+# --- レベルオーダーでの直列化 ---
+NULL_TOKENS = ("null", "none", "#")  # 子が存在しないことを表すトークン
+
+def serialize_level_order(root: Optional[TreeNode]) -> List[Optional[int]]:
+    """
+    二分木をレベルオーダー (BFS 順) の値の列に直列化します。
+    存在しない子は None で表し、末尾の None は省略します (LeetCode と同じ形式)。
+
+    例: 木 [[3], [9, 20], [15, 7]] -> [3, 9, 20, None, None, 15, 7]
+
+    時間計算量: O(N)
+    空間計算量: O(W)  (結果のリストを除く)
+    """
+    result: List[Optional[int]] = []
+    if not root:
+        return result
+    queue: deque[Optional[TreeNode]] = deque([root])
+    while queue:
+        node = queue.popleft()
+        if node is None:
+            result.append(None)
+            continue
+        result.append(node.val)
+        queue.append(node.left)
+        queue.append(node.right)
+    while result and result[-1] is None:
+        result.pop()
+    return result
+
+def deserialize_level_order(values: Iterable[Optional[int]]) -> Optional[TreeNode]:
+    """
+    serialize_level_order の形式の値の列から二分木を復元します。
+    末尾の None は省略されていても構いません。
+
+    時間計算量: O(N)
+    空間計算量: O(W)  (復元した木を除く)
+    """
+    it = iter(values)
+    first = next(it, None)
+    if first is None:
+        return None
+    root = TreeNode(first)
+    queue = deque([root]) # 子をまだ割り当てていないノード
+    while queue:
+        node = queue.popleft()
+        left = next(it, None)
+        if left is not None:
+            node.left = TreeNode(left)
+            queue.append(node.left)
+        right = next(it, None)
+        if right is not None:
+            node.right = TreeNode(right)
+            queue.append(node.right)
+    return root
+
+def parse_level_order(text: str) -> List[Optional[int]]:
+    """
+    "3,9,20,null,null,15,7" や "[3, 9, 20, null, null, 15, 7]" のような文字列を値の列に変換します。
+    区切りはカンマまたは空白、欠けている子は null / None / # で表します。
+    """
+    tokens = text.replace("[", " ").replace("]", " ").replace(",", " ").split()
+    return [None if token.lower() in NULL_TOKENS else int(token) for token in tokens]
+
+def format_level_order(values: Iterable[Optional[int]]) -> str:
+    """値の列を "3,9,20,null,null,15,7" 形式の文字列に変換します。"""
+    return ",".join("null" if v is None else str(v) for v in values)
+
+
 # --- 実行例 ---
 if __name__ == '__main__':
     # テスト用の木の構築 例1
@@ -290,3 +363,10 @@ if __name__ == '__main__':
     print("Zigzag Level Order Traversal (空):", zigzag_level_order(None))
     print("Minimum Depth (空):", min_depth(None))
     print("-" * 30)
+
+    # レベルオーダーでの直列化
+    print("--- 直列化 ---")
+    serialized = format_level_order(serialize_level_order(root1))
+    print("木 1:", serialized) # 3,9,20,null,null,15,7
+    print("復元して Level Order:", level_order_traversal(deserialize_level_order(parse_level_order(serialized))))
+    print("-" * 30)
@@ -0,0 +1,256 @@
+# coding: utf-8
+import heapq
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from tree_bfs_example import TreeNode, level_order_traversal, min_depth
+
+"""
+インクリメンタルな木のインデックス (Tree BFS の結果を更新に追従させる)
+
+min_depth や level_order_traversal は、呼び出すたびに木全体を BFS します。
+木がノードの挿入・削除で少しずつしか変化しない場合、毎回の再走査は無駄です。
+
+このモジュールの TreeLevelIndex は、最初に 1 回だけ BFS してから以下を保持し続けます。
+- 各ノードの深さ (と親)
+- レベルごとのノード集合
+- レベルごとの葉の数と、葉が存在する深さの最小ヒープ
+
+挿入・削除では影響を受けるノードだけを更新するため、
+- 最小の深さ: O(1) (ならし)
+- レベルのサイズ: O(1)
+- レベルのノード一覧: O(レベルのサイズ)
+で答えられます。
+"""
+
+
+class TreeLevelIndex:
+    """
+    二分木のレベル情報を保持し、挿入・削除に合わせて差分更新するインデックス。
+
+    深さは min_depth と同じく 1 始まり (ルートの深さが 1) です。
+    木の変更は必ずこのインデックスの insert / delete を通して行ってください。
+    """
+
+    def __init__(self, root: Optional[TreeNode]):
+        """
+        木を 1 回 BFS してインデックスを構築します。
+
+        時間計算量: O(N)
+        空間計算量: O(N)
+        """
+        self.root: Optional[TreeNode] = None
+        self._depth: Dict[TreeNode, int] = {}
+        self._parent: Dict[TreeNode, Optional[TreeNode]] = {}
+        # _levels[d - 1] は深さ d のノードの集合 (挿入順を保つため dict をキー集合として使う)
+        self._levels: List[Dict[TreeNode, None]] = []
+        # _leaf_count[d - 1] は深さ d にある葉の数
+        self._leaf_count: List[int] = []
+        # 葉が存在する (かもしれない) 深さの最小ヒープ。
+        # 葉の数が 0 になった深さはすぐには取り除かず、min_depth で遅延削除する。
+        # 同じ深さは 1 つしか入れない (_leaf_depths_queued がヒープにある深さの集合) ため、
+        # 葉の数が 0 と 1 の間を何度往復してもヒープは増えず、delete で高さの 2 倍以内に保つ
+        self._leaf_depths: List[int] = []
+        self._leaf_depths_queued: Set[int] = set()
+        if root is not None:
+            self.root = root
+            self._add_subtree(root, 1, None)
+
+    # --- 問い合わせ ---
+
+    def min_depth(self) -> int:
+        """
+        ルートから最も近い葉までのノード数を返します (空の木は 0)。
+        min_depth(root) と同じ値を、木を走査せずに返します。
+
+        時間計算量: O(1) ならし (古くなったヒープ要素の遅延削除は O(log N) ずつ)
+        """
+        heap, leaf_count = self._leaf_depths, self._leaf_count
+        while heap and (heap[0] > len(leaf_count) or leaf_count[heap[0] - 1] == 0):
+            self._leaf_depths_queued.discard(heapq.heappop(heap))
+        return heap[0] if heap else 0
+
+    def height(self) -> int:
+        """木の高さ (レベル数) を返します。時間計算量: O(1)"""
+        return len(self._levels)
+
+    def level_size(self, depth: int) -> int:
+        """深さ depth のノード数を返します。時間計算量: O(1)"""
+        if 1 <= depth <= len(self._levels):
+            return len(self._levels[depth - 1])
+        return 0
+
+    def level_nodes(self, depth: int) -> List[TreeNode]:
+        """
+        深さ depth のノードの一覧を返します (順序は左右ではなく登録順)。
+        時間計算量: O(レベルのサイズ)
+        """
+        if 1 <= depth <= len(self._levels):
+            return list(self._levels[depth - 1])
+        return []
+
+    def depth_of(self, node: TreeNode) -> int:
+        """ノードの深さを返します。インデックスにないノードは KeyError。時間計算量: O(1)"""
+        return self._depth[node]
+
+    def __contains__(self, node: TreeNode) -> bool:
+        return node in self._depth
+
+    # --- 更新 ---
+
+    def insert(self, parent: Optional[TreeNode], node: TreeNode, side: str = "left") -> None:
+        """
+        node を parent の左 (side="left") または右 (side="right") の子として挿入します。
+        parent が None の場合は、空の木のルートとして挿入します。
+        node が子を持つ場合は、その部分木ごと挿入されます。
+
+        時間計算量: O(log N) (1 ノードの場合。部分木なら O(部分木のサイズ + log N))
+        """
+        if parent is None:
+            if self.root is not None:
+                raise ValueError("tree already has a root")
+            self._check_new_subtree(node)
+            self.root = node
+            self._add_subtree(node, 1, None)
+            return
+
+        if parent not in self._depth:
+            raise KeyError("parent is not in the index")
+        if side not in ("left", "right"):
+            raise ValueError(f"side must be 'left' or 'right', got {side!r}")
+        if getattr(parent, side) is not None:
+            raise ValueError(f"parent already has a {side} child")
+        # 木を書き換える前に確認する (途中で失敗すると木とインデックスが食い違うため)
+        self._check_new_subtree(node)
+
+        depth = self._depth[parent]
+        if self._is_leaf(parent):
+            self._leaf_count[depth - 1] -= 1  # parent は葉ではなくなる
+        setattr(parent, side, node)
+        self._add_subtree(node, depth + 1, parent)
+
+    def delete(self, node: TreeNode) -> None:
+        """
+        node をその部分木ごと木から取り除きます。
+
+        時間計算量: O(部分木のサイズ + log N)  (葉 1 つの削除なら O(log N))
+        """
+        if node not in self._depth:
+            raise KeyError("node is not in the index")
+
+        parent = self._parent[node]
+        if parent is None:
+            self.root = None
+        else:
+            if parent.left is node:
+                parent.left = None
+            else:
+                parent.right = None
+            if self._is_leaf(parent):
+                self._add_leaf(self._depth[parent])  # parent が新しく葉になった
+
+        # 部分木のノードをインデックスから取り除く (木の構造自体は node 以下でそのまま残す)
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            depth = self._depth.pop(current)
+            del self._parent[current]
+            del self._levels[depth - 1][current]
+            if self._is_leaf(current):
+                self._leaf_count[depth - 1] -= 1
+            if current.left:
+                stack.append(current.left)
+            if current.right:
+                stack.append(current.right)
+
+        # 末尾の空になったレベルを切り詰める
+        while self._levels and not self._levels[-1]:
+            self._levels.pop()
+            self._leaf_count.pop()
+        # 深い部分木を消すと、もう存在しない深さがヒープに残る。高さの 2 倍を超えたら作り直す
+        if len(self._leaf_depths) > 2 * len(self._levels):
+            self._leaf_depths = [depth for depth in self._leaf_depths
+                                 if depth <= len(self._leaf_count) and self._leaf_count[depth - 1]]
+            heapq.heapify(self._leaf_depths)
+            self._leaf_depths_queued = set(self._leaf_depths)
+
+    # --- 内部処理 ---
+
+    @staticmethod
+    def _is_leaf(node: TreeNode) -> bool:
+        return not node.left and not node.right
+
+    def _add_leaf(self, depth: int) -> None:
+        self._leaf_count[depth - 1] += 1
+        if self._leaf_count[depth - 1] == 1 and depth not in self._leaf_depths_queued:
+            # 古い要素がまだヒープに残っていれば、それがそのまま有効な要素に戻る
+            self._leaf_depths_queued.add(depth)
+            heapq.heappush(self._leaf_depths, depth)
+
+    def _check_new_subtree(self, node: TreeNode) -> None:
+        # 挿入する部分木のノードが、既に木にあるノードや部分木の中の別の位置と重複していないか
+        seen = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current in self._depth or current in seen:
+                raise ValueError("node is already in the tree")
+            seen.add(current)
+            if current.left:
+                stack.append(current.left)
+            if current.right:
+                stack.append(current.right)
+
+    def _add_subtree(self, node: TreeNode, depth: int, parent: Optional[TreeNode]) -> None:
+        # node 以下は _check_new_subtree で確認済み
+        queue = deque([(node, depth, parent)])
+        while queue:
+            current, d, p = queue.popleft()
+            if d > len(self._levels):
+                self._levels.append({})
+                self._leaf_count.append(0)
+            self._depth[current] = d
+            self._parent[current] = p
+            self._levels[d - 1][current] = None
+            if self._is_leaf(current):
+                self._add_leaf(d)
+            if current.left:
+                queue.append((current.left, d + 1, current))
+            if current.right:
+                queue.append((current.right, d + 1, current))
+
+
+# --- 実行例 ---
+if __name__ == '__main__':
+    #     3
+    #    / \
+    #   9  20
+    #     /  \
+    #    15   7
+    root = TreeNode(3, TreeNode(9), TreeNode(20, TreeNode(15), TreeNode(7)))
+    index = TreeLevelIndex(root)
+    print("最小の深さ:", index.min_depth())  # 2
+    print("レベルのサイズ:", [index.level_size(d) for d in range(1, index.height() + 1)])  # [1, 2, 2]
+
+    # ノード 9 の下に子を追加すると、最も近い葉は深さ 3 になる
+    nine = root.left
+    index.insert(nine, TreeNode(8), "left")
+    print("\n9 の左に 8 を挿入")
+    print("最小の深さ:", index.min_depth(), "/ BFS:", min_depth(root))  # 3 / 3
+    print("深さ 3 のノード:", [n.val for n in index.level_nodes(3)])  # [15, 7, 8]
+
+    # ノード 20 の部分木を削除すると、残る葉は 8 だけ
+    index.delete(root.right)
+    print("\n20 の部分木を削除")
+    print("最小の深さ:", index.min_depth(), "/ BFS:", min_depth(root))  # 3 / 3
+    print("レベルのサイズ:", [index.level_size(d) for d in range(1, index.height() + 1)])  # [1, 1, 1]
+    print("Level Order:", level_order_traversal(root))  # [[3], [9], [8]]
+
+    # 葉 8 を削除すると 9 が葉に戻る
+    index.delete(nine.left)
+    print("\n8 を削除")
+    print("最小の深さ:", index.min_depth(), "/ BFS:", min_depth(root))  # 2 / 2
+
+    index.delete(root)
+    print("\nルートを削除")
+    print("最小の深さ:", index.min_depth(), "高さ:", index.height())  # 0 0
@@ -0,0 +1,165 @@
+# coding: utf-8
+"""
+ファイル上の直列化された木を、メモリに載せずにレベルごとに走査する
+
+level_order_traversal や zigzag_level_order は TreeNode の木全体をメモリに必要とします。
+ところが serialize_level_order の形式 ("3,9,20,null,null,15,7") は BFS の順そのものなので、
+先頭から順に読むだけでレベルを復元できます。
+- 1つ目の値が根 (レベル 0)
+- レベル d に (null でない) ノードが c 個あれば、続く 2c 個の値がその子 (左, 右, 左, 右, ...) で、
+  そのうち null でないものがレベル d + 1 のノード
+TreeNode は作らず、保持するのは「今返しているレベル」と「次のレベル」の値だけなので、
+メモリは最も幅の広いレベルの大きさで抑えられます。ファイルは先頭から1回だけ読みます。
+
+ファイルの形式は practice_cli の tree コマンドと同じ (1行に1本の木) です。
+1行がメモリに載らないほど長くても、chunk_size 文字ずつ読むので問題ありません。
+"""
+
+from typing import Iterable, Iterator, List, Optional, TextIO, Union
+
+from tree_bfs_example import NULL_TOKENS
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_SEPARATORS = str.maketrans("[],", "   ")
+
+
+def _parse_token(token: str) -> Optional[int]:
+    return None if token.lower() in NULL_TOKENS else int(token)
+
+
+def iter_level_order_values(stream: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+                            ) -> Iterator[Optional[int]]:
+    """
+    テキストストリームの現在位置から1本の木 (1行) を読み、値を1つずつ返します (null は None)。
+    空白だけの行は読み飛ばし、木の行末で止まるため、続けて呼ぶと次の行の木を読みます。
+    "[]" のように値のない行も1本の (空の) 木として扱い、何も返さずにその行末で止まります
+    (practice_cli の tree コマンドと同じく、空白以外の文字を含む行はすべて木の行です)。
+
+    空間計算量: O(chunk_size)
+    """
+    partial = ""  # チャンクの境目で切れたトークンの前半
+    started = False
+    while True:
+        piece = stream.readline(chunk_size)  # 行末か chunk_size 文字のどちらか早い方まで
+        if not piece:
+            break
+        ends_line = piece.endswith("\n")
+        if not started and not piece.isspace():
+            started = True  # 括弧や区切りだけでも木の行が始まっている
+        tokens = (partial + piece).translate(_SEPARATORS).split()
+        partial = ""
+        if tokens and not ends_line and not piece[-1].isspace() and piece[-1] not in "[],":
+            partial = tokens.pop()  # 次のチャンクに続いている可能性がある
+        for token in tokens:
+            yield _parse_token(token)
+        if ends_line and started:
+            break
+    if partial:
+        yield _parse_token(partial)
+
+
+def iter_levels(values: Iterable[Optional[int]], zigzag: bool = False) -> Iterator[List[int]]:
+    """
+    serialize_level_order の形式の値の列から、木を作らずにレベルごとの値のリストを返します。
+
+    Args:
+        values: レベル順の値 (None は子がないこと)。末尾の None は省略されていてもよい
+        zigzag: True なら奇数番目のレベル (根を 0 番目とする) を右から左の順で返す
+            (zigzag_level_order と同じ)
+
+    Yields:
+        各レベルの値のリスト
+
+    時間計算量: O(N)
+    空間計算量: O(W)  # W は最も幅の広いレベルのノード数
+    """
+    it = iter(values)
+    first = next(it, None)
+    if first is None:
+        return
+    level = [first]
+    depth = 0
+    while level:
+        yield level[::-1] if zigzag and depth % 2 else level
+        next_level = []
+        # このレベルの各ノードについて、左の子と右の子の2つの値が続く
+        for _ in range(2 * len(level)):
+            value = next(it, None)
+            if value is not None:
+                next_level.append(value)
+        level = next_level
+        depth += 1
+
+
+def stream_level_order(source: Union[str, TextIO], zigzag: bool = False,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[int]]:
+    """
+    ファイル (パスまたはテキストストリーム) の木をレベルごとに返します。
+    level_order_traversal (zigzag=True なら zigzag_level_order) の結果を1レベルずつ返すのと同じです。
+
+    パスを渡した場合は先頭行の木を、ストリームを渡した場合は現在位置の行の木を読みます。
+    最後のレベルを返した後は、その行に残っている値 (末尾の null の詰め物など) を読み捨てて
+    行末まで進むため、続けて呼ぶと次の行の木を読みます (途中で反復をやめた場合は行の途中に残ります)。
+    """
+    if isinstance(source, str):
+        with open(source, encoding="utf-8") as f:
+            yield from _levels_of_line(f, zigzag, chunk_size)
+    else:
+        yield from _levels_of_line(source, zigzag, chunk_size)
+
+
+def _levels_of_line(stream: TextIO, zigzag: bool, chunk_size: int) -> Iterator[List[int]]:
+    values = iter_level_order_values(stream, chunk_size)
+    yield from iter_levels(values, zigzag)
+    for _ in values:  # レベルに使われなかった残りの値を行末まで読み捨てる
+        pass
+
+
+def stream_zigzag_level_order(source: Union[str, TextIO],
+                              chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[int]]:
+    """stream_level_order(source, zigzag=True) と同じです。"""
+    return stream_level_order(source, zigzag=True, chunk_size=chunk_size)
+
+
+# --- 実行例 ---
+if __name__ == "__main__":
+    import io
+    import os
+    import tempfile
+    import tracemalloc
+
+    from tree_bfs_example import (deserialize_level_order, format_level_order, level_order_traversal,
+                                  parse_level_order, serialize_level_order, zigzag_level_order)
+
+    text = "3,9,20,null,null,15,7\n\n[1, 2, 3, 4, null, null, 5]\n"
+    stream = io.StringIO(text)
+    print(list(stream_level_order(stream)))           # 出力: [[3], [9, 20], [15, 7]]
+    print(list(stream_zigzag_level_order(stream)))    # 出力: [[1], [3, 2], [4, 5]]
+    print(list(stream_level_order(stream)))           # 出力: []  (もう木がない)
+
+    # 大きな完全二分木をファイルに書き出し、木を作る方法とメモリを比べる
+    n = 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(format_level_order(range(n)) + "\n")
+
+        tracemalloc.start()
+        deepest = None
+        for level in stream_level_order(path, chunk_size=4096):
+            deepest = level
+        _, streamed_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        with open(path, encoding="utf-8") as f:
+            root = deserialize_level_order(parse_level_order(f.read()))
+        levels = level_order_traversal(root)
+        _, tree_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert deepest == levels[-1]
+        assert list(stream_zigzag_level_order(path)) == zigzag_level_order(root)
+        assert serialize_level_order(root) == list(range(n))
+        print(f"{n} ノード: ストリーム {streamed_peak / 2**20:.1f} MiB, 木を構築 {tree_peak / 2**20:.1f} MiB")
@@ -2,6 +2,8 @@
 
 import collections
 
+import instrumentation
+
 # Definition for a binary tree node.
 class TreeNode:
     def __init__(self, val=0, left=None, right=None):
@@ -98,10 +100,11 @@ def dfs_pre_order_iterative(root: TreeNode):
     Input: 木の根ノード (TreeNode)
     Output: 訪問したノードの値のリスト (List[int])
     """
-    if not root:
-        return []
+    started = instrumentation.start()
     result = []
-    stack = [root]
+    stack = [root] if root else []
+    if started is not None:
+        stack = instrumentation.PeakList(stack)  # 同じループのままスタックの最大の深さを記録する
     while stack:
         node = stack.pop()
         result.append(node.val)  # 現在のノードを処理
@@ -110,6 +113,8 @@ def dfs_pre_order_iterative(root: TreeNode):
             stack.append(node.right)
         if node.left:
             stack.append(node.left)
+    if started is not None:
+        instrumentation.emit("dfs_pre_order_iterative", started, {"visited": len(result)}, stack.peak)
     return result
 
 def dfs_in_order_iterative(root: TreeNode):
@@ -118,8 +123,11 @@ def dfs_in_order_iterative(root: TreeNode):
     Input: 木の根ノード (TreeNode)
     Output: 訪問したノードの値のリスト (List[int])
     """
+    started = instrumentation.start()
     result: list[int] = []
     stack: list[TreeNode] = []
+    if started is not None:
+        stack = instrumentation.PeakList()
     current: TreeNode | None = root
     while current or stack:
         # 左端まで進む
@@ -131,6 +139,8 @@ def dfs_in_order_iterative(root: TreeNode):
         result.append(current.val) # 現在のノードを処理
         # 右の子へ移動
         current = current.right
+    if started is not None:
+        instrumentation.emit("dfs_in_order_iterative", started, {"visited": len(result)}, stack.peak)
     return result
 
 def dfs_post_order_iterative(root: TreeNode):
@@ -139,10 +149,11 @@ def dfs_post_order_iterative(root: TreeNode):
     Input: 木の根ノード (TreeNode)
     Output: 訪問したノードの値のリスト (List[int])
     """
-    if not root:
-        return []
+    started = instrumentation.start()
     result: collections.deque[int] = collections.deque() # 結果を逆順で追加するためdequeを使用
-    stack: list[TreeNode] = [root]
+    stack: list[TreeNode] = [root] if root else []
+    if started is not None:
+        stack = instrumentation.PeakList(stack)
     while stack:
         node: TreeNode = stack.pop()
         result.appendleft(node.val) # 結果の先頭に追加 (Pre-orderの逆順)
@@ -151,8 +162,53 @@ def dfs_post_order_iterative(root: TreeNode):
             stack.append(node.left)
         if node.right:
             stack.append(node.right)
+    if started is not None:
+        instrumentation.emit("dfs_post_order_iterative", started, {"visited": len(result)}, stack.peak)
     return list(result)
 
+# --- 遅延評価のイテレータ版 (スタック使用) ---
+
+def in_order_iter(root: TreeNode | None):
+    """
+    中間順 (In-order) でノードを1つずつ返すジェネレータ
+    Input: 木の根ノード (TreeNode)
+    Output: 中間順に並んだノード (Iterator[TreeNode])
+
+    dfs_in_order_iterative と同じ走査ですが、結果のリストを作らないため
+    追加のメモリはスタック分の O(H) だけで済み、途中で打ち切ることもできます。
+    """
+    stack: list[TreeNode] = []
+    current = root
+    while current or stack:
+        # 左端まで進む
+        while current:
+            stack.append(current)
+            current = current.left
+        current = stack.pop()
+        yield current
+        # 右の子へ移動
+        current = current.right
+
+def reverse_in_order_iter(root: TreeNode | None):
+    """
+    逆中間順 (右の子 -> 現在のノード -> 左の子) でノードを1つずつ返すジェネレータ
+    Input: 木の根ノード (TreeNode)
+    Output: 逆中間順に並んだノード (Iterator[TreeNode])
+
+    二分探索木では値の降順になります。追加のメモリは O(H) です。
+    """
+    stack: list[TreeNode] = []
+    current = root
+    while current or stack:
+        # 右端まで進む
+        while current:
+            stack.append(current)
+            current = current.right
+        current = stack.pop()
+        yield current
+        # 左の子へ移動
+        current = current.left
+
 
 # --- 例題1: Sum of Path Numbers (medium) ---
 def sum_numbers(root: TreeNode) -> int:
@@ -274,6 +330,10 @@ if __name__ == '__main__':
     print("In-order:", dfs_in_order_iterative(root))    # Expected: [4, 2, 5, 1, 3, 6]
     print("Post-order:", dfs_post_order_iterative(root)) # Expected: [4, 5, 2, 6, 3, 1]
 
+    print("\n--- Lazy Iterators ---")
+    print("In-order:", [node.val for node in in_order_iter(root)])                  # Expected: [4, 2, 5, 1, 3, 6]
+    print("Reverse In-order:", [node.val for node in reverse_in_order_iter(root)])  # Expected: [6, 3, 1, 5, 2, 4]
+
     # 例題1: Sum of Path Numbers
     #     1
     #    / \
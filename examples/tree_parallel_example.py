@@ -0,0 +1,367 @@
+# coding: utf-8
+"""
+Tree Traversal の並列化 (配列ベースの木 + 共有メモリ + プロセスプール)
+
+1 億ノード規模の木に対して dfs_pre_order_iterative や level_order_traversal を
+1 スレッドで実行すると数分かかります。このモジュールでは木を配列 (val/left/right)
+で表現し、以下の手順で複数プロセスに分割して走査します。
+
+1. ルートから BFS で「カットレベル」d まで降り、深さ d のノード (部分木の根) を
+   左から右の順に集めます。
+2. 木の配列を共有メモリ (multiprocessing.shared_memory) に置き、各ワーカープロセスは
+   コピーせずにそれをアタッチして、担当する部分木だけを走査します。
+3. 親プロセスは深さ d 未満の「上部」だけを走査し、深さ d のノードに到達したところで
+   ワーカーが返した部分木の結果を差し込みます (pre/in/post)。
+   レベルオーダーの場合は、相対レベルごとに部分木の結果を左から順に連結します。
+
+部分木同士は互いに独立しているため、この分割で結果の順序は単一スレッドの走査と
+完全に一致します。
+"""
+
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tree_bfs_example import TreeNode, level_order_traversal
+
+ORDERS = ("pre", "in", "post", "level")
+
+
+class ArrayTree:
+    """
+    配列ベースの二分木。
+
+    ノード i の値は val[i]、左右の子のインデックスは left[i] / right[i] で、
+    子が存在しない場合は -1 です。ルートはインデックス 0 (空の木は n == 0)。
+    TreeNode オブジェクトを使わないため、ノードあたりのメモリは 24 バイトで済み、
+    共有メモリにそのまま載せることができます。
+    """
+
+    def __init__(self, val: array, left: array, right: array):
+        self.val = val
+        self.left = left
+        self.right = right
+
+    def __len__(self) -> int:
+        return len(self.val)
+
+    @classmethod
+    def from_tree(cls, root: Optional[TreeNode]) -> "ArrayTree":
+        """
+        TreeNode の木を BFS 順に番号付けして ArrayTree に変換します。
+
+        時間計算量: O(N)
+        空間計算量: O(N)
+        """
+        val, left, right = array("q"), array("q"), array("q")
+        if root is None:
+            return cls(val, left, right)
+
+        queue = deque([root])
+        next_index = 1  # 次にキューへ入るノードに割り当てるインデックス
+        while queue:
+            node = queue.popleft()
+            val.append(node.val)
+            if node.left:
+                left.append(next_index)
+                next_index += 1
+                queue.append(node.left)
+            else:
+                left.append(-1)
+            if node.right:
+                right.append(next_index)
+                next_index += 1
+                queue.append(node.right)
+            else:
+                right.append(-1)
+        return cls(val, left, right)
+
+    @classmethod
+    def complete(cls, n: int) -> "ArrayTree":
+        """
+        値 0..n-1 を持つ完全二分木 (ヒープ配置: 子は 2i+1, 2i+2) を作ります。
+        ベンチマーク用の大きな木を素早く作るのに使います。
+        """
+        left = array("q", (c if c < n else -1 for c in range(1, 2 * n, 2)))
+        right = array("q", (c if c < n else -1 for c in range(2, 2 * n + 1, 2)))
+        return cls(array("q", range(n)), left, right)
+
+
+# --- 部分木の走査 (親プロセス・ワーカー共通) ---
+
+def _pre_order(val, left, right, root: int) -> array:
+    out = array("q")
+    stack = [root]
+    while stack:
+        i = stack.pop()
+        out.append(val[i])
+        # スタックは LIFO なので、右の子を先に入れる
+        if right[i] >= 0:
+            stack.append(right[i])
+        if left[i] >= 0:
+            stack.append(left[i])
+    return out
+
+
+def _in_order(val, left, right, root: int) -> array:
+    out = array("q")
+    stack: List[int] = []
+    current = root
+    while current >= 0 or stack:
+        # 左端まで進む
+        while current >= 0:
+            stack.append(current)
+            current = left[current]
+        current = stack.pop()
+        out.append(val[current])
+        current = right[current]
+    return out
+
+
+def _post_order(val, left, right, root: int) -> array:
+    # 根 -> 右 -> 左 の順に集めて最後に反転すると後行順になる
+    out = array("q")
+    stack = [root]
+    while stack:
+        i = stack.pop()
+        out.append(val[i])
+        if left[i] >= 0:
+            stack.append(left[i])
+        if right[i] >= 0:
+            stack.append(right[i])
+    out.reverse()
+    return out
+
+
+def _levels(val, left, right, root: int) -> List[array]:
+    result: List[array] = []
+    level = [root]
+    while level:
+        result.append(array("q", (val[i] for i in level)))
+        next_level = []
+        for i in level:
+            if left[i] >= 0:
+                next_level.append(left[i])
+            if right[i] >= 0:
+                next_level.append(right[i])
+        level = next_level
+    return result
+
+
+_TRAVERSALS = {"pre": _pre_order, "in": _in_order, "post": _post_order, "level": _levels}
+
+
+# --- ワーカープロセス側 ---
+
+# ワーカーごとに 1 度だけ共有メモリへアタッチし、その後のタスクで使い回す
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_arrays: Optional[Tuple[memoryview, memoryview, memoryview]] = None
+
+
+def _init_worker(shm_name: str, n: int) -> None:
+    global _worker_shm, _worker_arrays
+    # ワーカーは親プロセスの resource tracker を共有するので、unlink は親だけが行えばよい
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    words = _worker_shm.buf.cast("q")
+    _worker_arrays = (words[:n], words[n:2 * n], words[2 * n:3 * n])
+
+
+def _run_chunk(roots: Sequence[int], order: str) -> list:
+    val, left, right = _worker_arrays
+    traverse = _TRAVERSALS[order]
+    return [traverse(val, left, right, r) for r in roots]
+
+
+# --- 親プロセス側 ---
+
+def _find_cut(tree: ArrayTree, cut_level: Optional[int], min_roots: int
+              ) -> Tuple[int, List[array], List[int]]:
+    """
+    カットレベルまで BFS し、(カットレベル, 上部の各レベルの値, 部分木の根) を返します。
+    cut_level が None の場合は、幅が min_roots 以上になる最初のレベルを選びます。
+    """
+    val, left, right = tree.val, tree.left, tree.right
+    top_levels: List[array] = []
+    frontier = [0]
+    depth = 0
+    while frontier:
+        if cut_level is None:
+            if len(frontier) >= min_roots:
+                break
+        elif depth == cut_level:
+            break
+        top_levels.append(array("q", (val[i] for i in frontier)))
+        next_frontier = []
+        for i in frontier:
+            if left[i] >= 0:
+                next_frontier.append(left[i])
+            if right[i] >= 0:
+                next_frontier.append(right[i])
+        frontier = next_frontier
+        depth += 1
+    return depth, top_levels, frontier
+
+
+def _stitch_dfs(tree: ArrayTree, order: str, cut: int, parts: Dict[int, array]) -> List[int]:
+    """上部を明示的なスタックで走査し、深さ cut のノードで部分木の結果を差し込みます。"""
+    val, left, right = tree.val, tree.left, tree.right
+    out = array("q")
+    # (ノード, 深さ, 値を出力するだけか)。cut_level は任意に大きくできるので再帰は使わない
+    stack = [(0, 0, False)]
+    while stack:
+        i, depth, emit = stack.pop()
+        if emit:
+            out.append(val[i])
+        elif depth == cut:
+            out.extend(parts[i])
+        else:
+            # スタックは LIFO なので、出力したい順の逆に積む
+            steps = [(left[i], depth + 1, False), (i, depth, True), (right[i], depth + 1, False)]
+            if order == "pre":
+                steps.insert(0, steps.pop(1))
+            elif order == "post":
+                steps.append(steps.pop(1))
+            for step in reversed(steps):
+                if step[0] >= 0:
+                    stack.append(step)
+    return out.tolist()
+
+
+def _stitch_levels(top_levels: List[array], roots: List[int], parts: Dict[int, List[array]]
+                   ) -> List[List[int]]:
+    result = [level.tolist() for level in top_levels]
+    relative = 0
+    while True:
+        level = array("q")
+        for r in roots:  # 根は左から右の順に並んでいる
+            sub_levels = parts[r]
+            if relative < len(sub_levels):
+                level.extend(sub_levels[relative])
+        if not level:
+            return result
+        result.append(level.tolist())
+        relative += 1
+
+
+def parallel_traversal(tree: ArrayTree, order: str = "pre", max_workers: int = 4,
+                       cut_level: Optional[int] = None, chunks_per_worker: int = 4):
+    """
+    配列ベースの木を複数プロセスで並列に走査します。
+
+    Args:
+        tree: 走査する ArrayTree。
+        order: "pre" / "in" / "post" / "level" のいずれか。
+        max_workers: ワーカープロセス数。1 以下なら親プロセスだけで走査します。
+        cut_level: 部分木に分割する深さ。None なら
+                   max_workers * chunks_per_worker 個以上の根が得られる深さを自動で選びます。
+        chunks_per_worker: ワーカーあたりのタスク数の目安 (負荷の偏りを均すため)。
+
+    Returns:
+        "pre" / "in" / "post" の場合は値のリスト (List[int])、
+        "level" の場合はレベルごとの値のリスト (List[List[int]])。
+        結果は単一スレッドの走査 (dfs_*_iterative / level_order_traversal) と一致します。
+
+    時間計算量: O(N / P + 2^d)  P はワーカー数、d はカットレベル (上部のノード数は 2^d 未満)
+        結果の連結 (O(N)) は親プロセスで行いますが、array の一括コピーなので高速です。
+
+    空間計算量: O(N)
+        木そのものは共有メモリ上に 1 つだけ置かれ、ワーカーへはコピーされません。
+        部分木の結果は array('q') として返されるため、転送量はノードあたり 8 バイトです。
+    """
+    if order not in ORDERS:
+        raise ValueError(f"order must be one of {ORDERS}, got {order!r}")
+    n = len(tree)
+    if n == 0:
+        return []
+
+    traverse = _TRAVERSALS[order]
+    min_roots = max(2, max_workers * chunks_per_worker)
+    cut, top_levels, roots = _find_cut(tree, cut_level, min_roots)
+    if max_workers <= 1 or len(roots) < 2:
+        # 並列化しても得がない (細長い木など) 場合は、そのまま 1 プロセスで走査する
+        result = traverse(tree.val, tree.left, tree.right, 0)
+        return [level.tolist() for level in result] if order == "level" else result.tolist()
+
+    shm = shared_memory.SharedMemory(create=True, size=3 * n * 8)
+    try:
+        words = shm.buf.cast("q")
+        words[:n] = memoryview(tree.val)
+        words[n:2 * n] = memoryview(tree.left)
+        words[2 * n:3 * n] = memoryview(tree.right)
+        del words
+
+        chunk_size = -(-len(roots) // min_roots)  # 切り上げ除算
+        chunks = [roots[i:i + chunk_size] for i in range(0, len(roots), chunk_size)]
+        parts = {}
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shm.name, n)) as pool:
+            futures = [pool.submit(_run_chunk, chunk, order) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                parts.update(zip(chunk, future.result()))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if order == "level":
+        return _stitch_levels(top_levels, roots, parts)
+    return _stitch_dfs(tree, order, cut, parts)
+
+
+def benchmark_scaling(n: int = 2_000_000, worker_counts: Sequence[int] = (1, 2, 4, 8),
+                      orders: Sequence[str] = ORDERS) -> List[Tuple[str, int, float]]:
+    """
+    完全二分木 (n ノード) に対して、ワーカー数ごとの実行時間を計測します。
+
+    Returns:
+        (order, ワーカー数, 秒) のタプルのリスト。
+    """
+    tree = ArrayTree.complete(n)
+    rows = []
+    for order in orders:
+        for workers in worker_counts:
+            start = time.perf_counter()
+            parallel_traversal(tree, order, max_workers=workers)
+            rows.append((order, workers, time.perf_counter() - start))
+    return rows
+
+
+# --- 実行例 ---
+if __name__ == '__main__':
+    import os
+
+    from tree_dfs_example import (dfs_in_order_iterative, dfs_post_order_iterative,
+                                  dfs_pre_order_iterative)
+
+    #     3
+    #    / \
+    #   9  20
+    #     /  \
+    #    15   7
+    root = TreeNode(3, TreeNode(9), TreeNode(20, TreeNode(15), TreeNode(7)))
+    small = ArrayTree.from_tree(root)
+    print("--- 小さな木 (cut_level=1, 2 ワーカー) ---")
+    print("Pre-order:", parallel_traversal(small, "pre", max_workers=2, cut_level=1))    # [3, 9, 20, 15, 7]
+    print("In-order:", parallel_traversal(small, "in", max_workers=2, cut_level=1))      # [9, 3, 15, 20, 7]
+    print("Post-order:", parallel_traversal(small, "post", max_workers=2, cut_level=1))  # [9, 15, 7, 20, 3]
+    print("Level:", parallel_traversal(small, "level", max_workers=2, cut_level=1))      # [[3], [9, 20], [15, 7]]
+
+    # 単一スレッドの実装と結果が一致することを確認
+    def build(values, i=0):
+        if i >= len(values):
+            return None
+        return TreeNode(values[i], build(values, 2 * i + 1), build(values, 2 * i + 2))
+
+    big_root = build(list(range(1000)))
+    big = ArrayTree.from_tree(big_root)
+    assert parallel_traversal(big, "pre", max_workers=2) == dfs_pre_order_iterative(big_root)
+    assert parallel_traversal(big, "in", max_workers=2) == dfs_in_order_iterative(big_root)
+    assert parallel_traversal(big, "post", max_workers=2) == dfs_post_order_iterative(big_root)
+    assert parallel_traversal(big, "level", max_workers=2) == level_order_traversal(big_root)
+    print("\n1000 ノードの木: 単一スレッドの走査と一致しました")
+
+    print(f"\n--- スケーリング (完全二分木, CPU コア数: {os.cpu_count()}) ---")
+    for order, workers, seconds in benchmark_scaling(n=1_000_000, worker_counts=(1, 2, 4)):
+        print(f"{order:>5}  workers={workers}  {seconds:.3f}s")
@@ -39,14 +39,18 @@ Output: [1, 2]
 ## 実装
 """
 
-from typing import List
+from typing import List, Optional, Sequence
 
-def find_pair_with_target_sum(numbers: List[int], target: int) -> List[int]:
+from buffer_views import INT64_MAX, abs_bound, as_ndarray, chunk_size, is_integer, np, numeric_view
+from tree_dfs_example import TreeNode, in_order_iter, reverse_in_order_iter
+
+def find_pair_with_target_sum(numbers: Sequence[int], target: int) -> List[int]:
     """
     ソート済み配列内で、指定されたターゲット値になる2つの要素のインデックス（1-based）を見つけます。
 
     Args:
-        numbers (List[int]): 昇順にソートされた整数のリスト。
+        numbers (Sequence[int]): 昇順にソートされた整数のリスト。
+            array.array や NumPy 配列などのバッファも、リストに変換せずにそのまま読みます。
         target (int): 目標とする合計値。
 
     Returns:
@@ -62,6 +66,28 @@ def find_pair_with_target_sum(numbers: List[int], target: int) -> List[int]:
         - ポインタ変数（left, right）と合計値を格納する変数以外に追加のメモリを使用しません。
         - 結果を格納するためのスペースは通常、空間計算量に含まれませんが、もし含める場合はO(1)またはO(2)であり、定数です。
     """
+    pair = try_find_pair_with_target_sum(numbers, target)
+    # 問題の制約により、解は必ず見つかるはずです。
+    assert pair, "解が必ず存在するはずですが、見つかりませんでした。"
+    return pair
+
+
+def try_find_pair_with_target_sum(numbers: Sequence[int], target: int) -> List[int]:
+    """
+    find_pair_with_target_sum と同じですが、解が存在しない入力では assert で止まらず、
+    空のリストを返します (任意の入力を受け取る CLI などで使う)。
+
+    時間計算量: O(n)
+    空間計算量: O(1)
+    """
+    view = numeric_view(numbers)
+    if view is not None:
+        values = as_ndarray(view)
+        # 整数で、target - 要素 が int64 に収まるときだけ NumPy を使う
+        if values is not None and is_integer(view) and abs_bound(values) + abs(target) <= INT64_MAX:
+            return _find_pair_with_target_sum_ndarray(values, target)
+        numbers = view  # バッファを memoryview として直接読む
+
     left = 0  # 配列の開始地点を指すポインタ
     right = len(numbers) - 1  # 配列の終了地点を指すポインタ
 
@@ -81,11 +107,89 @@ def find_pair_with_target_sum(numbers: List[int], target: int) -> List[int]:
             # rightポインタを左に移動して、合計を減らす
             right -= 1
 
-    # 問題の制約により、このループは必ずターゲットを見つけて終了するはずです。
-    # したがって、以下の行には到達しない想定です。
-    assert False, "解が必ず存在するはずですが、見つかりませんでした。"
-    # 型チェッカーを満たすために形式的にreturn文を記述しますが、実行されることはありません。
-    return [] # 到達不能コード (Unreachable code)
+    # 解が見つからなかった
+    return []
+
+
+def _find_pair_with_target_sum_ndarray(values, target: int) -> List[int]:
+    """
+    find_pair_with_target_sum の NumPy 版。chunk_size(n) 個の左側の候補ごとに、
+    相方 (target - 左の値) を二分探索でまとめて探します。
+
+    2つのポインタは「相方が存在する最小の左インデックス」と「その相方の最大のインデックス」で
+    止まるため、同じ値が複数あっても2つのポインタ版と同じインデックスを返します。
+
+    時間計算量: O(n log n)  # ただし要素ごとの処理はベクトル化される
+    空間計算量: O(chunk_size(n))  # values のコピーは作らない
+    """
+    info = np.iinfo(values.dtype)
+    n = len(values)
+    step = chunk_size(n)
+    for start in range(0, n, step):
+        left_values = values[start:start + step].astype(np.int64)
+        if 2 * int(left_values[0]) > target:
+            break  # 相方は左の値以上なので、これ以降に解はない
+        complements = target - left_values
+        # values と同じ型で探す (型が違うと searchsorted が values 全体を変換してしまう)
+        keys = np.clip(complements, max(info.min, -INT64_MAX), min(info.max, INT64_MAX)).astype(values.dtype)
+        right = np.searchsorted(values, keys, side="right") - 1
+        left = np.arange(start, start + len(left_values))
+        found = (right > left) & (values[np.maximum(right, 0)].astype(np.int64) == complements)
+        hits = np.flatnonzero(found)
+        if len(hits):
+            i = int(hits[0])
+            return [start + i + 1, int(right[i]) + 1]
+    return []
+
+
+def find_pair_with_target_sum_bst(root: Optional[TreeNode], target: int) -> List[int]:
+    """
+    二分探索木 (BST) 上で、合計がターゲット値になる2つのノードの値を見つけます。
+
+    木を dfs_in_order_iterative でソート済みリストに展開してから
+    find_pair_with_target_sum を呼ぶ代わりに、
+    - left: 中間順イテレータ (昇順に進む)
+    - right: 逆中間順イテレータ (降順に進む)
+    の2つを Two Pointers として直接使います。
+
+    Args:
+        root (Optional[TreeNode]): 二分探索木のルートノード。
+        target (int): 目標とする合計値。
+
+    Returns:
+        List[int]: 合計がターゲット値になる2つのノードの値 [小さい方, 大きい方]。
+                   見つからない場合は空のリストを返します。
+
+    時間計算量 (Time Complexity): O(N)
+        - 各イテレータは最大で N 個のノードを返し、ポインタが出会った時点か
+          最初に一致した時点で終了します。
+
+    空間計算量 (Space Complexity): O(H)
+        - H は木の高さ。2つのイテレータがそれぞれ O(H) のスタックを持つだけで、
+          O(N) のリストは作りません。
+    """
+    if root is None:
+        return []
+
+    forward = in_order_iter(root)  # 昇順
+    backward = reverse_in_order_iter(root)  # 降順
+    left = next(forward)
+    right = next(backward)
+
+    # ポインタは1つずつしか進まないので、交差する前に必ず同じノードで出会う
+    while left is not right:
+        current_sum = left.val + right.val
+
+        if current_sum == target:
+            return [left.val, right.val]
+        elif current_sum < target:
+            # より大きな値が必要なので、昇順側を進める
+            left = next(forward)
+        else: # current_sum > target
+            # より小さな値が必要なので、降順側を進める
+            right = next(backward)
+
+    return []
 
 # --- テストコード ---
 if __name__ == '__main__':
@@ -120,3 +224,16 @@ if __name__ == '__main__':
     print(f"Input: numbers = {numbers4}, target = {target4}")
     print(f"Output: {result4}") # Expected: [1, 2]
     print("-" * 20)
+
+    # テストケース5 (二分探索木)
+    #       8
+    #      / \
+    #     3   10
+    #    / \    \
+    #   1   6    14
+    bst = TreeNode(8, TreeNode(3, TreeNode(1), TreeNode(6)), TreeNode(10, None, TreeNode(14)))
+    for target5 in (16, 7, 28):
+        result5 = find_pair_with_target_sum_bst(bst, target5)
+        print(f"Input: bst = [1, 3, 6, 8, 10, 14], target = {target5}")
+        print(f"Output: {result5}") # Expected: [6, 10] / [1, 6] / []
+    print("-" * 20)